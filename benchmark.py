@@ -0,0 +1,314 @@
+import argparse
+import json
+import sys
+import time
+
+import pygame
+
+from classes.Collider import Collider
+from classes.DirtyRects import dirtyRects
+from classes.Input import ScriptedInputSource
+from classes.Presenter import scalingModes
+from classes.Profiler import Profiler, profiler
+from classes.Replay import ReplayPlayer
+from classes.Simulation import Simulation
+from entities.EntityBase import EntityBase
+
+# python benchmark.py                       run and print percentiles
+# python benchmark.py --save-baseline       also store them as the baseline
+# python benchmark.py --compare             compare against the stored baseline
+# python benchmark.py --collider            tile collision moves per second, for
+#                                           Collider and the checkY/checkX it
+#                                           replaced; --save-baseline and
+#                                           --compare work too
+# python benchmark.py --replay run.replay    profile a recorded session
+# python benchmark.py --display-size 1920x1080 --scaling pixel-perfect
+#                                           present to a larger window
+
+levels = ["Level1-1", "Level1-2"]
+
+traces = {
+    "idle": [(600, [])],
+    "walk": [(600, [pygame.K_RIGHT])],
+    "run-jump": [
+        (40, [pygame.K_RIGHT, pygame.K_LSHIFT]),
+        (15, [pygame.K_RIGHT, pygame.K_LSHIFT, pygame.K_SPACE]),
+    ] * 11,
+    "back-and-forth": [
+        (120, [pygame.K_RIGHT]),
+        (60, [pygame.K_LEFT]),
+        (20, [pygame.K_UP]),
+    ] * 3,
+}
+
+phases = [
+    "frame", "drawLevel", "tiles", "entities", "dashboard",
+    "mario", "physics", "collision", "present", "collider",
+]
+# collider moves timed together; the collider run reports milliseconds per batch
+colliderBatch = 1000
+
+
+# window size and scaling mode the frames are presented with
+displayOptions = {}
+
+
+def runTrace(levelName, segments, warmup):
+    source = ScriptedInputSource(segments)
+    profiler.reset()
+    profiler.enabled = False
+    profiler.recording = True
+    sim = Simulation(levelName, source, present=True, **displayOptions)
+    while not source.finished():
+        if sim.frame == warmup:
+            profiler.enabled = True
+        if not sim.step():
+            # Mario died: restart the level and keep playing the trace
+            profiler.enabled = False
+            previous = sim
+            sim = Simulation(levelName, source, present=True, **displayOptions)
+            previous.release()
+    sim.release()
+    profiler.enabled = False
+    profiler.recording = False
+    return profiler.summary()
+
+
+def runReplay(path, warmup):
+    # the same recorded input and seed on every branch; a diverging
+    # checksum means the branch changed gameplay, not just speed
+    player = ReplayPlayer(path)
+    profiler.reset()
+    profiler.enabled = False
+    profiler.recording = True
+    sim = Simulation(player.levelName, player, seed=player.seed, present=True, **displayOptions)
+    while not player.finished():
+        if sim.frame == warmup:
+            profiler.enabled = True
+        if not sim.step():
+            break
+    sim.release()
+    profiler.enabled = False
+    profiler.recording = False
+    print(player.report())
+    return profiler.summary()
+
+
+class LegacyCollider:
+    # checkY and checkX as they were before Collider's swept moves, on the
+    # list of rows of tile rects Level used to keep: the "before" of
+    # --collider
+    def __init__(self, entity, level):
+        self.entity = entity
+        self.levelObj = level
+        tileMap = level.tileMap
+        self.level = [
+            [tileMap.rectAt(x, y) for x in range(tileMap.originX, tileMap.originX + tileMap.width)]
+            for y in range(tileMap.height)
+        ]
+
+    def moveY(self):
+        self.entity.rect.y += self.entity.vel.y
+        self.checkY()
+
+    def moveX(self):
+        self.entity.rect.x += self.entity.vel.x
+        self.checkX()
+
+    def checkX(self):
+        if self.leftLevelBorderReached() or self.rightLevelBorderReached():
+            return
+        try:
+            rows = [
+                self.level[self.entity.getPosIndex().y],
+                self.level[self.entity.getPosIndex().y + 1],
+                self.level[self.entity.getPosIndex().y + 2],
+            ]
+        except Exception:
+            return
+        for row in rows:
+            tiles = row[self.entity.getPosIndex().x : self.entity.getPosIndex().x + 2]
+            for tile in tiles:
+                if tile is not None:
+                    if self.entity.rect.colliderect(tile):
+                        if self.entity.vel.x > 0:
+                            self.entity.rect.right = tile.left
+                            self.entity.vel.x = 0
+                        if self.entity.vel.x < 0:
+                            self.entity.rect.left = tile.right
+                            self.entity.vel.x = 0
+
+    def checkY(self):
+        self.entity.onGround = False
+        try:
+            rows = [
+                self.level[self.entity.getPosIndex().y],
+                self.level[self.entity.getPosIndex().y + 1],
+                self.level[self.entity.getPosIndex().y + 2],
+            ]
+        except Exception:
+            self.entity.alive = None
+            return
+        for row in rows:
+            tiles = row[self.entity.getPosIndex().x : self.entity.getPosIndex().x + 2]
+            for tile in tiles:
+                if tile is not None:
+                    if self.entity.rect.colliderect(tile):
+                        if self.entity.vel.y > 0:
+                            self.entity.onGround = True
+                            self.entity.rect.bottom = tile.top
+                            self.entity.vel.y = 0
+                        if self.entity.vel.y < 0:
+                            self.entity.rect.top = tile.bottom
+                            self.entity.vel.y = 0
+
+    def rightLevelBorderReached(self):
+        if self.entity.getPosIndexAsFloat().x > self.levelObj.levelLength - 1:
+            self.entity.rect.x = (self.levelObj.levelLength - 1) * 32
+            self.entity.vel.x = 0
+            return True
+
+    def leftLevelBorderReached(self):
+        if self.entity.rect.x < 0:
+            self.entity.rect.x = 0
+            self.entity.vel.x = 0
+            return True
+
+
+def runCollider(levelName, moves, colliderClass=Collider):
+    # one moveY and moveX of a 32x32 probe per sample, spread over the
+    # part of the level that is loaded
+    sim = Simulation(levelName)
+    probe = EntityBase(0, 0, 1.25)
+    collider = colliderClass(probe, sim.level)
+    width = min(sim.level.levelLength, sim.level.tileMap.width) * 32 - 64
+    samples = [
+        ((i * 37) % width, (i * 53) % 400, ((i % 11) - 5) * 0.9, ((i % 13) - 6) * 1.25)
+        for i in range(moves)
+    ]
+    batchTimes = []
+    for first in range(0, moves, colliderBatch):
+        start = time.perf_counter()
+        for x, y, velX, velY in samples[first:first + colliderBatch]:
+            probe.rect.x = x
+            probe.rect.y = y
+            probe.vel.x = velX
+            probe.vel.y = velY
+            collider.moveY()
+            collider.moveX()
+        batchTimes.append(time.perf_counter() - start)
+    sim.release()
+    print("{:<12} {:>10.0f} moves/s with {}".format(levelName, moves / sum(batchTimes), colliderClass.__name__))
+    return {"collider": Profiler.stats(batchTimes)}
+
+
+def runAll(levelNames, traceNames, warmup):
+    results = {}
+    for levelName in levelNames:
+        for traceName in traceNames:
+            results["{}/{}".format(levelName, traceName)] = runTrace(
+                levelName, traces[traceName], warmup
+            )
+    return results
+
+
+def printResults(results, unit="milliseconds per frame"):
+    print("{:<28} {:<10} {:>8} {:>8} {:>8} {:>8}".format("run", "phase", "p50", "p95", "p99", "max"))
+    for run, summary in results.items():
+        for phase in phases:
+            if phase not in summary:
+                continue
+            s = summary[phase]
+            print("{:<28} {:<10} {:>8.3f} {:>8.3f} {:>8.3f} {:>8.3f}".format(
+                run, phase, s["p50"], s["p95"], s["p99"], s["max"]
+            ))
+    print("({})".format(unit))
+
+
+def compare(results, baseline, threshold):
+    regressions = 0
+    print("{:<28} {:<10} {:>10} {:>10} {:>8}".format("run", "phase", "base p95", "now p95", "change"))
+    for run, summary in results.items():
+        if run not in baseline:
+            continue
+        for phase in phases:
+            if phase not in summary or phase not in baseline[run]:
+                continue
+            before = baseline[run][phase]["p95"]
+            after = summary[phase]["p95"]
+            change = (after - before) / before * 100 if before else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  SLOWER"
+                regressions += 1
+            elif change < -threshold:
+                flag = "  faster"
+            print("{:<28} {:<10} {:>10.3f} {:>10.3f} {:>+7.1f}%{}".format(
+                run, phase, before, after, change, flag
+            ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-time benchmark over scripted runs")
+    parser.add_argument("--levels", nargs="+", default=levels)
+    parser.add_argument("--traces", nargs="+", default=list(traces), choices=list(traces))
+    parser.add_argument("--warmup", type=int, default=30, help="frames ignored at the start of a run")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p95 change in percent reported as a regression")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="present only the changed regions")
+    parser.add_argument("--display-size", default="640x480", metavar="WxH",
+                        help="window size the frames are scaled to")
+    parser.add_argument("--scaling", choices=scalingModes, default="nearest")
+    parser.add_argument("--collider", action="store_true",
+                        help="run the tile collision microbenchmark instead")
+    parser.add_argument("--moves", type=int, default=200000)
+    parser.add_argument("--replay", nargs="+", metavar="FILE",
+                        help="profile recorded sessions instead of the scripted traces")
+    args = parser.parse_args()
+    dirtyRects.enabled = args.dirty_rects
+    displayOptions["displaySize"] = tuple(int(n) for n in args.display_size.split("x"))
+    displayOptions["scaling"] = args.scaling
+
+    if args.collider:
+        results = {}
+        for levelName in args.levels:
+            results["{}/collider".format(levelName)] = runCollider(levelName, args.moves)
+            results["{}/collider-legacy".format(levelName)] = runCollider(
+                levelName, args.moves, LegacyCollider
+            )
+        printResults(results, "milliseconds per {} moves".format(colliderBatch))
+    elif args.replay:
+        results = {path: runReplay(path, args.warmup) for path in args.replay}
+        printResults(results)
+    else:
+        results = runAll(args.levels, args.traces, args.warmup)
+        printResults(results)
+
+    if args.compare:
+        with open(args.baseline) as jsonData:
+            baseline = json.load(jsonData)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("{} phase(s) slower than the baseline".format(regressions))
+            sys.exit(1)
+    if args.save_baseline:
+        # runs saved earlier, e.g. the collider next to the traces, are kept
+        try:
+            with open(args.baseline) as jsonData:
+                baseline = json.load(jsonData)
+        except (IOError, ValueError):
+            baseline = {}
+        baseline.update(results)
+        with open(args.baseline, "w") as outfile:
+            json.dump(baseline, outfile, indent=2)
+        print("baseline saved to {}".format(args.baseline))
+
+
+if __name__ == "__main__":
+    main()
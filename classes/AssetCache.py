@@ -0,0 +1,138 @@
+import hashlib
+import json
+import struct
+
+import pygame
+
+from classes import CacheFile
+from classes.Animation import Animation
+from classes.Sprite import Sprite
+
+# Processed sprite surfaces, stored as raw pixel buffers so startup can skip
+# decoding and scaling. The file is keyed by a hash of every source file.
+#
+#   magic, version, sha1 of the sources, index length, JSON index, pixels
+#
+# Build it ahead of time with: python -m classes.AssetCache
+
+cacheFile = "./cache/sprites.bin"
+magic = b"MSPR"
+version = 1
+header = struct.Struct("<4sI20sI")
+
+
+def sourceDigest(manifests, images):
+    paths = list(manifests)
+    for url in manifests:
+        with open(url) as jsonData:
+            paths.append(json.load(jsonData)["spriteSheetURL"])
+    paths.extend(images)
+    digest = hashlib.sha1()
+    for path in sorted(set(paths)):
+        digest.update(path.encode("utf-8"))
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.digest()
+
+
+def save(spriteCollection, digest, path=cacheFile):
+    surfaces = []
+    surfaceIndex = {}
+    blobs = []
+    offset = 0
+
+    def addSurface(surface):
+        nonlocal offset
+        if surface is None:
+            return None
+        if id(surface) not in surfaceIndex:
+            alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+            fmt = "RGBA" if alpha else "RGB"
+            pixels = pygame.image.tostring(surface, fmt)
+            colorkey = surface.get_colorkey()
+            surfaces.append({
+                "size": surface.get_size(),
+                "format": fmt,
+                "colorkey": list(colorkey)[:3] if colorkey is not None else None,
+                "offset": offset,
+                "length": len(pixels),
+            })
+            blobs.append(pixels)
+            offset += len(pixels)
+            surfaceIndex[id(surface)] = len(surfaces) - 1
+        return surfaceIndex[id(surface)]
+
+    sprites = {}
+    for name, sprite in spriteCollection.items():
+        animation = None
+        if sprite.animation is not None:
+            animation = {
+                "images": [addSurface(image) for image in sprite.animation.images],
+                "idle": addSurface(sprite.animation.idleSprite),
+                "air": addSurface(sprite.animation.airSprite),
+                "deltaTime": sprite.animation.deltaTime,
+            }
+        sprites[name] = {
+            "image": addSurface(sprite.image),
+            "colliding": sprite.colliding,
+            "redrawBackground": sprite.redrawBackground,
+            "animation": animation,
+        }
+
+    index = json.dumps({"surfaces": surfaces, "sprites": sprites}).encode("utf-8")
+    CacheFile.write(path, [header.pack(magic, version, digest, len(index)), index] + blobs)
+
+
+def load(digest, path=cacheFile):
+    data = CacheFile.read(path)
+    fields = CacheFile.unpackHeader(data, header, magic, version)
+    if fields is None:
+        return None
+    fileDigest, indexLength = fields
+    if fileDigest != digest:
+        return None
+    start = header.size + indexLength
+    index = json.loads(data[header.size:start].decode("utf-8"))
+
+    surfaces = []
+    for entry in index["surfaces"]:
+        pixels = data[start + entry["offset"]:start + entry["offset"] + entry["length"]]
+        surface = pygame.image.fromstring(pixels, tuple(entry["size"]), entry["format"])
+        if entry["format"] == "RGB":
+            # back to the usual 32 bit format; convert() would need the
+            # display, which is not up yet when Mario is imported
+            opaque = pygame.Surface(surface.get_size())
+            opaque.blit(surface, (0, 0))
+            surface = opaque
+        if entry["colorkey"] is not None:
+            surface.set_colorkey(entry["colorkey"], pygame.RLEACCEL)
+        surfaces.append(surface)
+
+    def getSurface(i):
+        return surfaces[i] if i is not None else None
+
+    spriteCollection = {}
+    for name, entry in index["sprites"].items():
+        animation = None
+        if entry["animation"] is not None:
+            animation = Animation(
+                [getSurface(i) for i in entry["animation"]["images"]],
+                getSurface(entry["animation"]["idle"]),
+                getSurface(entry["animation"]["air"]),
+                entry["animation"]["deltaTime"],
+            )
+        spriteCollection[name] = Sprite(
+            getSurface(entry["image"]),
+            entry["colliding"],
+            animation,
+            entry["redrawBackground"],
+        )
+    return spriteCollection
+
+
+if __name__ == "__main__":
+    from classes.Sprites import Sprites
+
+    sprites = Sprites(useCache=False)
+    save(sprites.spriteCollection, sprites.digest)
+    print("wrote {} sprites to {}".format(len(sprites.spriteCollection), cacheFile))
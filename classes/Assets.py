@@ -0,0 +1,139 @@
+import os
+import threading
+
+import pygame
+
+from classes import SoundCache
+
+
+def surfaceBytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def assetBytes(asset):
+    if isinstance(asset, pygame.Surface):
+        return surfaceBytes(asset)
+    if isinstance(asset, dict):
+        # glyph tables
+        return sum(assetBytes(value) for value in asset.values())
+    if hasattr(asset, "spriteCollection"):
+        surfaces = {}
+        for sprite in asset.spriteCollection.values():
+            if sprite.image is not None:
+                surfaces[id(sprite.image)] = sprite.image
+            if sprite.animation is not None:
+                for image in sprite.animation.images:
+                    surfaces[id(image)] = image
+        return sum(surfaceBytes(surface) for surface in surfaces.values())
+    if isinstance(asset, pygame.mixer.Sound):
+        init = pygame.mixer.get_init()
+        if init is None:
+            return 0
+        frequency, size, channels = init
+        return int(asset.get_length() * frequency * channels * abs(size) // 8)
+    return 0
+
+
+def entryBytes(entry):
+    # glyph and string caches fill up after they are acquired, so their
+    # size is taken when asked for
+    asset, references, size = entry
+    if isinstance(asset, dict):
+        return assetBytes(asset)
+    return size
+
+
+class AssetManager:
+    # Each asset is loaded once and shared by everyone who acquired it;
+    # owners release their references when they are torn down, and an
+    # asset is forgotten when its last reference goes. Sounds are acquired
+    # from the preload thread too, so the tables are only touched under
+    # the lock; loaders run outside it and may acquire other assets.
+    def __init__(self):
+        # key -> [asset, references, bytes]
+        self.entries = {}
+        self.loadCounts = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, key, loader):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+        asset = loader()
+        size = assetBytes(asset)
+        with self.lock:
+            entry = self.entries.get(key)
+            # another thread may have loaded it meanwhile; the first one wins
+            if entry is None:
+                entry = [asset, 0, size]
+                self.entries[key] = entry
+                self.loadCounts[key] = self.loadCounts.get(key, 0) + 1
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.entries[key]
+
+    def image(self, path):
+        return self.acquire(("image", os.path.normpath(path)), lambda: pygame.image.load(path))
+
+    def sheet(self, path):
+        def load():
+            try:
+                sheet = pygame.image.load(path)
+            except pygame.error:
+                print("Unable to load spritesheet image:", path)
+                raise SystemExit
+            if not sheet.get_alpha():
+                sheet.set_colorkey((0, 0, 0))
+            return sheet
+        return self.acquire(("sheet", os.path.normpath(path)), load)
+
+    def font(self, path, loader):
+        return self.acquire(("font", os.path.normpath(path)), loader)
+
+    def sprites(self):
+        from classes.Sprites import Sprites
+
+        return self.acquire(("sprites",), Sprites)
+
+    def sound(self, path):
+        return self.acquire(("sound", os.path.normpath(path)), lambda: SoundCache.sound(path))
+
+    def totalBytes(self):
+        with self.lock:
+            return sum(entryBytes(entry) for entry in self.entries.values())
+
+    def report(self):
+        lines = ["{:<8} {:<36} {:>5} {:>5} {:>9}".format("kind", "asset", "loads", "refs", "KB")]
+        with self.lock:
+            entries = sorted(self.entries.items())
+        for key, entry in entries:
+            name = key[1] if len(key) > 1 else ""
+            lines.append("{:<8} {:<36} {:>5} {:>5} {:>9.1f}".format(
+                key[0], name, self.loadCounts[key], entry[1], entryBytes(entry) / 1024.0
+            ))
+        lines.append("{} assets, {:.1f} KB decoded, {} loads".format(
+            len(self.entries), self.totalBytes() / 1024.0, sum(self.loadCounts.values())
+        ))
+        try:
+            import resource
+
+            # kilobytes on Linux
+            lines.append("peak RSS {:.1f} MB".format(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+            ))
+        except ImportError:
+            pass
+        return "\n".join(lines)
+
+
+assets = AssetManager()
@@ -0,0 +1,39 @@
+import os
+
+# The files under ./cache: a struct header that starts with a magic and a
+# version, then the payload. They are only ever a shortcut, so a missing,
+# stale or unwritable file just means building from the sources again.
+
+
+def read(path):
+    # the whole file, None if it cannot be read
+    try:
+        with open(path, "rb") as infile:
+            return infile.read()
+    except OSError:
+        return None
+
+
+def unpackHeader(data, header, magic, version):
+    # the header fields after magic and version, None if the data is too
+    # short or was written by another format
+    if data is None or len(data) < header.size:
+        return None
+    fields = header.unpack_from(data)
+    if fields[0] != magic or fields[1] != version:
+        return None
+    return fields[2:]
+
+
+def write(path, parts):
+    # replaced in one go, so a half written file is never read
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as outfile:
+            for part in parts:
+                outfile.write(part)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        # a read-only install just keeps building from the sources
+        return False
+    return True
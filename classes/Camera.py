@@ -7,10 +7,17 @@ class Camera:
         self.entity = entity
         self.x = self.pos.x * 32
         self.y = self.pos.y * 32
+        self.prevX = self.x
+
+    def drawX(self, alpha):
+        # horizontal offset between the previous and the current step
+        return self.x - (self.x - self.prevX) * (1 - alpha)
 
     def move(self):
+        self.prevX = self.x
         xPosFloat = self.entity.getPosIndexAsFloat().x
-        if 10 < xPosFloat < 50:
+        # Mario stays centred, half a screen (10 tiles) from either end
+        if 10 < xPosFloat < self.entity.levelObj.levelLength - 10:
             self.pos.x = -xPosFloat + 10
         self.x = self.pos.x * 32
         self.y = self.pos.y * 32
@@ -1,75 +1,147 @@
 class Collider:
+    # Moves an entity one axis at a time and stops it at the nearest solid
+    # tile between where it was and where it is going, so fast movers can
+    # not skip over a tile. Works on plain ints read from the rect and the
+    # tile map; nothing is allocated per call.
     def __init__(self, entity, level):
         self.entity = entity
-        self.level = level.level
         self.levelObj = level
-        self.result = []
 
-    def checkX(self):
-        if self.leftLevelBorderReached() or self.rightLevelBorderReached():
+    def moveY(self):
+        entity = self.entity
+        rect = entity.rect
+        entity.onGround = False
+        oldTop = rect.top
+        rect.y += entity.vel.y
+        if entity.vel.y != 0 and self.sweepY(oldTop, rect.top):
             return
-        try:
-            rows = [
-                self.level[self.entity.getPosIndex().y],
-                self.level[self.entity.getPosIndex().y + 1],
-                self.level[self.entity.getPosIndex().y + 2],
-            ]
-        except Exception:
-            return
-        for row in rows:
-            tiles = row[self.entity.getPosIndex().x : self.entity.getPosIndex().x + 2]
-            for tile in tiles:
-                if tile.rect is not None:
-                    if self.entity.rect.colliderect(tile.rect):
-                        if self.entity.vel.x > 0:
-                            self.entity.rect.right = tile.rect.left
-                            self.entity.vel.x = 0
-                        if self.entity.vel.x < 0:
-                            self.entity.rect.left = tile.rect.right
-                            self.entity.vel.x = 0
-
-    def checkY(self):
-        self.entity.onGround = False
-        
-        try:
-            rows = [
-                self.level[self.entity.getPosIndex().y],
-                self.level[self.entity.getPosIndex().y + 1],
-                self.level[self.entity.getPosIndex().y + 2],
-            ]
-        except Exception:
+        if rect.top // 32 + 2 >= self.levelObj.tileMap.height:
+            # fell out of the bottom of the map
             try:
-                self.entity.gameOver()
+                entity.gameOver()
             except Exception:
-                self.entity.alive = None
-            return
-        for row in rows:
-            tiles = row[self.entity.getPosIndex().x : self.entity.getPosIndex().x + 2]
-            for tile in tiles:
-                if tile.rect is not None:
-                    if self.entity.rect.colliderect(tile.rect):
-                        if self.entity.vel.y > 0:
-                            self.entity.onGround = True
-                            self.entity.rect.bottom = tile.rect.top
-                            self.entity.vel.y = 0
-                            # reset jump on bottom
-                            if self.entity.traits is not None:
-                                if "JumpTrait" in self.entity.traits:
-                                    self.entity.traits["JumpTrait"].reset()
-                                if "bounceTrait" in self.entity.traits:
-                                    self.entity.traits["bounceTrait"].reset()
-                        if self.entity.vel.y < 0:
-                            self.entity.rect.top = tile.rect.bottom
-                            self.entity.vel.y = 0
+                entity.alive = None
+
+    def sweepY(self, oldTop, newTop):
+        entity = self.entity
+        rect = entity.rect
+        tileMap = self.levelObj.tileMap
+        solid, ids, palette, width = tileMap.solid, tileMap.ids, tileMap.palette, tileMap.width
+        height = rect.height
+        oldBottom, newBottom = oldTop + height, newTop + height
+        falling = entity.vel.y > 0
+        # columns inside the tile map window
+        firstColumn = rect.left // 32 - tileMap.originX
+        lastColumn = (rect.right - 1) // 32 - tileMap.originX
+        # boxes sit a pixel above their cell, so look one row further down
+        if falling:
+            firstRow, lastRow = oldTop // 32, newBottom // 32
+        else:
+            firstRow, lastRow = newTop // 32, oldBottom // 32
+        if firstColumn < 0:
+            firstColumn = 0
+        if lastColumn >= width:
+            lastColumn = width - 1
+        if firstRow < 0:
+            firstRow = 0
+        if lastRow >= tileMap.height:
+            lastRow = tileMap.height - 1
+        best = None
+        for row in range(firstRow, lastRow + 1):
+            base = row * width
+            end = base + lastColumn + 1
+            index = solid.find(1, base + firstColumn, end)
+            while index != -1:
+                tileTop = row * 32 + palette[ids[index]].offsetY
+                tileBottom = tileTop + 32
+                if falling:
+                    # passed on the way down or overlapping the new rect
+                    if tileTop < newBottom and (tileTop >= oldBottom or tileBottom > newTop):
+                        if best is None or tileTop < best:
+                            best = tileTop
+                elif tileBottom > newTop and (tileBottom <= oldTop or tileTop < newBottom):
+                    if best is None or tileBottom > best:
+                        best = tileBottom
+                index = solid.find(1, index + 1, end)
+        if best is None:
+            return False
+        if falling:
+            rect.bottom = best
+            entity.onGround = True
+            # reset jump on bottom
+            if entity.traits is not None:
+                if "JumpTrait" in entity.traits:
+                    entity.traits["JumpTrait"].reset()
+                if "bounceTrait" in entity.traits:
+                    entity.traits["bounceTrait"].reset()
+        else:
+            rect.top = best
+        entity.vel.y = 0
+        return True
 
-    def rightLevelBorderReached(self):
-        if self.entity.getPosIndexAsFloat().x > self.levelObj.levelLength - 1:
-            self.entity.rect.x = (self.levelObj.levelLength - 1) * 32
-            self.entity.vel.x = 0
-            return True
+    def moveX(self):
+        entity = self.entity
+        rect = entity.rect
+        oldLeft = rect.left
+        rect.x += entity.vel.x
+        newLeft = rect.left
+        levelLength = self.levelObj.levelLength
+        # level borders
+        if newLeft < 0:
+            rect.x = 0
+            entity.vel.x = 0
+        elif newLeft / 32.0 > levelLength - 1:
+            rect.x = (levelLength - 1) * 32
+            entity.vel.x = 0
+        elif entity.vel.x != 0 and rect.top // 32 + 2 < self.levelObj.tileMap.height:
+            self.sweepX(oldLeft, newLeft)
 
-    def leftLevelBorderReached(self):
-        if self.entity.rect.x < 0:
-            self.entity.rect.x = 0
-            self.entity.vel.x = 0
-            return True
+    def sweepX(self, oldLeft, newLeft):
+        entity = self.entity
+        rect = entity.rect
+        tileMap = self.levelObj.tileMap
+        solid, ids, palette, width = tileMap.solid, tileMap.ids, tileMap.palette, tileMap.width
+        top, bottom = rect.top, rect.bottom
+        oldRight, newRight = oldLeft + rect.width, newLeft + rect.width
+        right = entity.vel.x > 0
+        originX = tileMap.originX
+        if right:
+            firstColumn, lastColumn = oldLeft // 32 - originX, (newRight - 1) // 32 - originX
+        else:
+            firstColumn, lastColumn = newLeft // 32 - originX, (oldRight - 1) // 32 - originX
+        firstRow = top // 32
+        lastRow = bottom // 32
+        if firstColumn < 0:
+            firstColumn = 0
+        if lastColumn >= width:
+            lastColumn = width - 1
+        if firstRow < 0:
+            firstRow = 0
+        if lastRow >= tileMap.height:
+            lastRow = tileMap.height - 1
+        best = None
+        for row in range(firstRow, lastRow + 1):
+            base = row * width
+            end = base + lastColumn + 1
+            index = solid.find(1, base + firstColumn, end)
+            while index != -1:
+                tileTop = row * 32 + palette[ids[index]].offsetY
+                if top < tileTop + 32 and tileTop < bottom:
+                    tileLeft = (index - base + originX) * 32
+                    tileRight = tileLeft + 32
+                    if right:
+                        if tileLeft < newRight and (tileLeft >= oldRight or tileRight > newLeft):
+                            if best is None or tileLeft < best:
+                                best = tileLeft
+                    elif tileRight > newLeft and (tileRight <= oldLeft or tileLeft < newRight):
+                        if best is None or tileRight > best:
+                            best = tileRight
+                index = solid.find(1, index + 1, end)
+        if best is None:
+            return False
+        if right:
+            rect.right = best
+        else:
+            rect.left = best
+        entity.vel.x = 0
+        return True
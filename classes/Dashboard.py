@@ -1,5 +1,6 @@
 import pygame
 
+from classes.DirtyRects import dirtyRects
 from classes.Font import Font
 
 
@@ -13,34 +14,56 @@ class Dashboard(Font):
         self.coins = 0
         self.ticks = 0
         self.time = 0
+        self.hudRect = pygame.Rect(50, 20, 540, 32)
+        self.hudSurface = None
+        self.lastHud = None
 
-    def update(self):
-        self.drawText("MARIO", 50, 20, 15)
-        self.drawText(self.pointString(), 50, 37, 15)
-
-        self.drawText("@x{}".format(self.coinString()), 225, 37, 15)
-
-        self.drawText("WORLD", 380, 20, 15)
-        self.drawText(str(self.levelName), 395, 37, 15)
-
-        self.drawText("TIME", 520, 20, 15)
-        if self.state != "menu":
-            self.drawText(self.timeString(), 535, 37, 15)
+    def startLevel(self, levelName):
+        self.state = "start"
+        self.time = 0
+        self.levelName = levelName.split("Level")[1]
 
-        # update Time
+    def update(self):
+        # one simulation step; 60 steps are a second
         self.ticks += 1
         if self.ticks == 60:
             self.ticks = 0
             self.time += 1
 
+    def draw(self):
+        # the HUD is only rendered again, and reported as changed,
+        # when one of its values did
+        hud = (self.points, self.coins, self.levelName, self.state, self.time)
+        if hud != self.lastHud:
+            self.lastHud = hud
+            self.renderHud()
+            dirtyRects.add(self.hudRect)
+        self.screen.blit(self.hudSurface, self.hudRect)
+
+    def renderHud(self):
+        if self.hudSurface is None:
+            self.hudSurface = pygame.Surface(self.hudRect.size)
+            self.hudSurface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        self.hudSurface.fill((0, 0, 0))
+        left, top = self.hudRect.topleft
+
+        def hudText(text, x, y):
+            self.hudSurface.blit(self.renderText(text, 15), (x - left, y - top))
+
+        hudText("MARIO", 50, 20)
+        hudText(self.pointString(), 50, 37)
+
+        hudText("@x{}".format(self.coinString()), 225, 37)
+
+        hudText("WORLD", 380, 20)
+        hudText(str(self.levelName), 395, 37)
+
+        hudText("TIME", 520, 20)
+        if self.state != "menu":
+            hudText(self.timeString(), 535, 37)
+
     def drawText(self, text, x, y, size):
-        for char in text:
-            charSprite = pygame.transform.scale(self.charSprites[char], (size, size))
-            self.screen.blit(charSprite, (x, y))
-            if char == " ":
-                x += size//2
-            else:
-                x += size
+        dirtyRects.add(self.screen.blit(self.renderText(text, size), (x, y)))
 
     def coinString(self):
         return "{:02d}".format(self.coins)
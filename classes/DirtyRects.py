@@ -0,0 +1,42 @@
+import pygame
+
+
+class DirtyRects:
+    def __init__(self, bounds=(0, 0, 640, 480)):
+        self.enabled = False
+        self.bounds = pygame.Rect(bounds)
+        # above this share of the screen a single full update is cheaper
+        self.fullFrameRatio = 0.5
+        self.rects = []
+        self.previous = []
+        self.full = True
+
+    def add(self, rect):
+        if self.enabled:
+            self.rects.append(pygame.Rect(rect))
+
+    def invalidate(self):
+        self.full = True
+
+    def flush(self):
+        # regions changed since the last present, None for the whole frame.
+        # Whatever was drawn last frame is pushed again so it gets erased.
+        rects = self.rects + self.previous
+        self.previous = self.rects
+        self.rects = []
+        if self.full:
+            self.full = False
+            return None
+        res = []
+        area = 0
+        for rect in rects:
+            rect = rect.clip(self.bounds)
+            if rect.width > 0 and rect.height > 0:
+                res.append(rect)
+                area += rect.width * rect.height
+        if area > self.bounds.width * self.bounds.height * self.fullFrameRatio:
+            return None
+        return res
+
+
+dirtyRects = DirtyRects()
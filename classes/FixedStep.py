@@ -0,0 +1,34 @@
+import time
+
+
+class FixedStep:
+    # Turns real time into a whole number of fixed simulation steps per
+    # rendered frame. alpha is how far the render time lies between the
+    # last two steps, for drawing at interpolated positions.
+    def __init__(self, rate=60, maxSteps=5):
+        self.stepTime = 1.0 / rate
+        # after a long stall, skip ahead instead of replaying every step
+        self.maxSteps = maxSteps
+        self.accumulator = 0.0
+        self.last = None
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last = None
+
+    def advance(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.accumulator += now - self.last
+        self.last = now
+        steps = 0
+        while self.accumulator >= self.stepTime and steps < self.maxSteps:
+            self.accumulator -= self.stepTime
+            steps += 1
+        if steps == self.maxSteps:
+            self.accumulator = min(self.accumulator, self.stepTime)
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.stepTime, 1.0)
@@ -1,3 +1,7 @@
+import os
+from collections import OrderedDict
+
+from classes.Assets import assets
 from classes.Spritesheet import Spritesheet
 import pygame
 
@@ -6,7 +10,53 @@ class Font(Spritesheet):
     def __init__(self, filePath, size):
         Spritesheet.__init__(self, filename=filePath)
         self.chars = " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
-        self.charSprites = self.loadFont()
+        path = os.path.normpath(filePath)
+        # every Dashboard and Item shares one set of glyphs per font file
+        self.charSprites = assets.font(path, self.loadFont)
+        # glyphs scaled to a size, keyed by (char, size)
+        self.scaledGlyphs = assets.acquire(("glyphs", path), dict)
+        # least recently used rendered strings, keyed by (text, size)
+        self.renderedText = assets.acquire(("text", path), OrderedDict)
+        self.maxRenderedText = 64
+        self.fontKeys = [("font", path), ("glyphs", path), ("text", path)]
+
+    def release(self):
+        Spritesheet.release(self)
+        for key in self.fontKeys:
+            assets.release(key)
+
+    def glyph(self, char, size):
+        key = (char, size)
+        glyph = self.scaledGlyphs.get(key)
+        if glyph is None:
+            glyph = pygame.transform.scale(self.charSprites[char], (size, size))
+            self.scaledGlyphs[key] = glyph
+        return glyph
+
+    def renderText(self, text, size):
+        key = (text, size)
+        surface = self.renderedText.get(key)
+        if surface is not None:
+            self.renderedText.move_to_end(key)
+            return surface
+        offsets = []
+        x = 0
+        for char in text:
+            offsets.append(x)
+            if char == " ":
+                x += size//2
+            else:
+                x += size
+        width = offsets[-1] + size if offsets else 0
+        surface = pygame.Surface((width, size))
+        # glyphs are keyed on black as well
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        for char, offset in zip(text, offsets):
+            surface.blit(self.glyph(char, size), (offset, 0))
+        self.renderedText[key] = surface
+        if len(self.renderedText) > self.maxRenderedText:
+            self.renderedText.popitem(last=False)
+        return surface
 
     def loadFont(self):
         font = {}
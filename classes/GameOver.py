@@ -0,0 +1,100 @@
+import os
+
+import pygame
+
+from classes.Assets import assets
+from classes.DirtyRects import dirtyRects
+
+outImage = "./img/out.png"
+# the out image grows from nothing to a quarter of the screen over
+# growSteps frames of a 60 Hz clock, with "YOUR OUT" fading in below it
+growSteps = 66
+stepRate = 60
+
+
+def prepare(screenSize):
+    # every scale step of the out image and the text
+    image = assets.image(outImage)
+    try:
+        image = image.convert_alpha()
+    except pygame.error:
+        pass
+    width, height = image.get_size()
+    targetWidth, targetHeight = screenSize[0] // 4, screenSize[1] // 4
+    # keep the aspect ratio
+    aspectRatio = width / float(height)
+    if targetWidth / float(targetHeight) > aspectRatio:
+        targetWidth = int(targetHeight * aspectRatio)
+    else:
+        targetHeight = int(targetWidth / aspectRatio)
+    steps = []
+    for step in range(growSteps + 1):
+        scale = step / float(growSteps)
+        size = (int(targetWidth * scale), int(targetHeight * scale))
+        if size[0] > 0 and size[1] > 0:
+            steps.append(pygame.transform.scale(image, size))
+        else:
+            steps.append(None)
+    # only the scaled steps are kept
+    assets.release(("image", os.path.normpath(outImage)))
+    text = pygame.font.Font(None, 48).render("YOUR OUT", True, (255, 255, 255))
+    return steps, text
+
+
+def sequenceKey(screenSize):
+    return ("gameOver", tuple(screenSize))
+
+
+def acquireSequence(screenSize):
+    # the session holds the sequence from before the menu, and each new
+    # session takes it before the old one lets go, so no death prepares it
+    return assets.acquire(sequenceKey(screenSize), lambda: prepare(screenSize))
+
+
+class GameOver:
+    # Shown after Mario dies, one frame at a time from the main loop:
+    # update() draws the step due and says whether the sequence is still
+    # running, which it is until the image is full size and the death
+    # sound has ended.
+    def __init__(self, screen, sound):
+        self.screen = screen
+        self.sound = sound
+        self.steps = None
+        self.text = None
+        self.startTime = None
+        self.drawnStep = None
+        self.key = None
+
+    def start(self):
+        if self.steps is None:
+            size = self.screen.get_size()
+            self.key = sequenceKey(size)
+            self.steps, self.text = acquireSequence(size)
+        self.startTime = pygame.time.get_ticks()
+        self.drawnStep = None
+
+    def release(self):
+        if self.key is not None:
+            assets.release(self.key)
+            self.key = None
+            self.steps = None
+
+    def update(self):
+        elapsed = pygame.time.get_ticks() - self.startTime
+        step = min(growSteps, elapsed * stepRate // 1000)
+        if step != self.drawnStep:
+            self.drawnStep = step
+            self.draw(step)
+        return step < growSteps or self.sound.music_channel.get_busy()
+
+    def draw(self, step):
+        dirtyRects.invalidate()
+        self.screen.fill((0, 0, 0))
+        image = self.steps[step]
+        if image is None:
+            return
+        centerX, centerY = self.screen.get_width() // 2, self.screen.get_height() // 2
+        imageRect = image.get_rect(center=(centerX, centerY))
+        self.screen.blit(image, imageRect)
+        self.text.set_alpha(255 * step // growSteps)
+        self.screen.blit(self.text, self.text.get_rect(center=(centerX, imageRect.bottom + 40)))
@@ -1,15 +0,0 @@
-import pygame
-from scipy.ndimage.filters import *
-
-
-class GaussianBlur:
-    def __init__(self, kernelsize=7):
-        self.kernel_size = kernelsize
-
-    def filter(self, srfc, xpos, ypos, width, height):
-        nSrfc = pygame.Surface((width, height))
-        pxa = pygame.surfarray.array3d(srfc)
-        blurred = gaussian_filter(pxa, sigma=(self.kernel_size, self.kernel_size, 0))
-        pygame.surfarray.blit_array(nSrfc, blurred)
-        del pxa
-        return nSrfc
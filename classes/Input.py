@@ -1,21 +1,77 @@
 import pygame
 from pygame.locals import *
-import sys
+
+
+class KeyboardInputSource:
+    def getPressedKeys(self):
+        return pygame.key.get_pressed()
+
+    def getMousePos(self):
+        return pygame.mouse.get_pos()
+
+    def filterEvents(self, events):
+        return events
+
+    def nextFrame(self):
+        pass
+
+
+class PressedKeys:
+    def __init__(self, keys):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class ScriptedInputSource:
+    # segments: list of (frameCount, keys) played one after another,
+    # after the last segment no key is held unless loop is set
+    def __init__(self, segments, mousePos=(0, 0), loop=False):
+        self.frames = []
+        for frameCount, keys in segments:
+            pressed = PressedKeys(keys)
+            self.frames.extend([pressed] * frameCount)
+        self.mousePos = mousePos
+        self.loop = loop
+        self.frame = 0
+        self.released = PressedKeys(())
+
+    def getPressedKeys(self):
+        if self.frame < len(self.frames):
+            return self.frames[self.frame]
+        if self.loop and self.frames:
+            return self.frames[self.frame % len(self.frames)]
+        return self.released
+
+    def getMousePos(self):
+        return self.mousePos
+
+    def filterEvents(self, events):
+        return events
+
+    def nextFrame(self):
+        self.frame += 1
+
+    def finished(self):
+        return not self.loop and self.frame >= len(self.frames)
 
 
 class Input:
-    def __init__(self, entity):
+    def __init__(self, entity, source=None):
         self.mouseX = 0
         self.mouseY = 0
         self.entity = entity
+        self.source = source if source is not None else KeyboardInputSource()
 
     def checkForInput(self, events):
+        events = self.source.filterEvents(events)
         self.checkForKeyboardInput()
         self.checkForMouseInput(events)
         self.checkForQuitAndRestartInputEvents(events)
 
     def checkForKeyboardInput(self):
-        pressedKeys = pygame.key.get_pressed()
+        pressedKeys = self.source.getPressedKeys()
 
         if pressedKeys[K_LEFT] or pressedKeys[K_h] and not pressedKeys[K_RIGHT]:
             self.entity.traits["goTrait"].direction = -1
@@ -30,7 +86,7 @@ class Input:
         self.entity.traits['goTrait'].boost = pressedKeys[K_LSHIFT]
 
     def checkForMouseInput(self, events):
-        mouseX, mouseY = pygame.mouse.get_pos()
+        mouseX, mouseY = self.source.getMousePos()
         if self.isRightMouseButtonPressed(events):
             self.entity.levelObj.addKoopa(
                 mouseY / 32, mouseX / 32 - self.entity.camera.pos.x
@@ -48,9 +104,6 @@ class Input:
 
     def checkForQuitAndRestartInputEvents(self, events):
         for event in events:
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
             if event.type == pygame.KEYDOWN and \
                 (event.key == pygame.K_ESCAPE or event.key == pygame.K_F5):
                 self.entity.pause = True
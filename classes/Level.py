@@ -1,8 +1,18 @@
-import json
+import math
+import random
+
+import numpy as np
 import pygame
 
-from classes.Sprites import Sprites
-from classes.Tile import Tile
+from collections import OrderedDict
+
+from classes.Assets import assets
+from classes.DirtyRects import dirtyRects
+from classes.LevelChunks import ChunkedLevel
+from classes.MobEngine import MobEngine
+from classes.Profiler import profiler
+from classes.SpatialHash import SpatialHash
+from classes.TileMap import TileMap
 from entities.Coin import Coin
 from entities.CoinBrick import CoinBrick
 from entities.Goomba import Goomba
@@ -14,142 +24,332 @@ from entities.Meloni import Meloni
 
 
 class Level:
-    def __init__(self, screen, sound, dashboard):
-        self.sprites = Sprites()
+    def __init__(self, screen, sound, dashboard, activationMargin=4, chunksBehind=1, chunksAhead=2):
+        self.sprites = assets.sprites()
         self.dashboard = dashboard
         self.sound = sound
         self.screen = screen
-        self.level = None
+        self.name = ""
+        self.tileMap = None
         self.levelLength = 0
         self.entityList = []
+        # only entities within activationMargin columns of the screen are
+        # updated; the others sleep in sleepingEntities until the camera
+        # comes close, so they cost nothing per frame. Walking mobs never
+        # sleep, or they would not be where they always were once Mario
+        # reaches them; their walk is batched, so it stays cheap.
+        self.activationMargin = activationMargin
+        self.awakeEntities = []
+        self.sleepingEntities = SpatialHash()
+        self.wakingEntities = []
+        self.spawnOrder = {}
+        self.spawnCount = 0
+        # broad phase for entity-vs-entity collisions, rebuilt every frame
+        self.entityGrid = SpatialHash()
+        # mobs only react to other mobs when those are bouncing shells
+        self.shellGrid = SpatialHash()
+        # moves goombas, koopas and mushrooms together
+        self.mobEngine = MobEngine(self)
+        # static tiles are baked into surfaces of chunkWidth columns
+        self.chunkWidth = 8
+        self.maxChunks = 16
+        self.chunks = OrderedDict()
+        self.animatedTiles = {}
+        self.lastCameraX = None
+        # the level is streamed from its chunk files: only the chunks from
+        # chunksBehind before the screen to chunksAhead after it are loaded,
+        # with their tiles in a tile map window and their entities spawned
+        self.source = None
+        self.chunksBehind = chunksBehind
+        self.chunksAhead = chunksAhead
+        self.residentChunks = range(0)
+        self.paletteIds = None
+        self.paletteSolid = None
+        # entity -> spawn id for entities from the level file, and back
+        self.spawnIds = {}
+        self.spawnedEntities = {}
+        # collected or killed, these never come back
+        self.removedSpawns = set()
+        # used blocks come back used when their chunk is loaded again
+        self.usedSpawns = set()
+        # mobs pick their directions from a copy of the global generator,
+        # so a level loaded in the background does not shift the random
+        # numbers the level being played sees
+        self.random = random.Random()
+        self.random.setstate(random.getstate())
+
+    def release(self):
+        for entity in self.entityList:
+            entity.release()
+        assets.release(("sprites",))
 
     def loadLevel(self, levelname):
-        with open("./levels/{}.json".format(levelname)) as jsonData:
-            data = json.load(jsonData)
-            self.loadLayers(data)
-            self.loadObjects(data)
-            self.loadEntities(data)
-            self.levelLength = data["length"]
-
-    def loadEntities(self, data):
-        try:
-            [self.addCoinBox(x, y) for x, y in data["level"]["entities"]["CoinBox"]]
-            [self.addGoomba(x, y) for x, y in data["level"]["entities"]["Goomba"]]
-            [self.addKoopa(x, y) for x, y in data["level"]["entities"]["Koopa"]]
-            [self.addCoin(x, y) for x, y in data["level"]["entities"]["coin"]]
-            [self.addCoinBrick(x, y) for x, y in data["level"]["entities"]["coinBrick"]]
-            [self.addRandomBox(x, y, item) for x, y, item in data["level"]["entities"]["RandomBox"]]
-            self.addMeloni(58, 12)
-        except:
-            # if no entities in Level
+        for _ in self.loadSteps(levelname):
             pass
 
-    def loadLayers(self, data):
-        layers = []
-        for x in range(*data["level"]["layers"]["sky"]["x"]):
-            layers.append(
-                (
-                        [
-                            Tile(self.sprites.spriteCollection.get("sky"), None)
-                            for y in range(*data["level"]["layers"]["sky"]["y"])
-                        ]
-                        + [
-                            Tile(
-                                self.sprites.spriteCollection.get("ground"),
-                                pygame.Rect(x * 32, (y - 1) * 32, 32, 32),
-                            )
-                            for y in range(*data["level"]["layers"]["ground"]["y"])
-                        ]
-                )
-            )
-        self.level = list(map(list, zip(*layers)))
-
-    def loadObjects(self, data):
-        for x, y in data["level"]["objects"]["bush"]:
-            self.addBushSprite(x, y)
-        for x, y in data["level"]["objects"]["cloud"]:
-            self.addCloudSprite(x, y)
-        for x, y, z in data["level"]["objects"]["pipe"]:
-            self.addPipeSprite(x, y, z)
-        for x, y in data["level"]["objects"]["sky"]:
-            self.level[y][x] = Tile(self.sprites.spriteCollection.get("sky"), None)
-        for x, y in data["level"]["objects"]["ground"]:
-            self.level[y][x] = Tile(
-                self.sprites.spriteCollection.get("ground"),
-                pygame.Rect(x * 32, y * 32, 32, 32),
-            )
+    def loadSteps(self, levelname):
+        # the loading work in small pieces, yielding the share done after
+        # each so a LevelLoader can spread it over frames
+        self.name = levelname
+        self.source = ChunkedLevel(levelname)
+        self.chunkWidth = self.source.chunkWidth
+        self.levelLength = self.source.length
+        # room for the chunks around any camera position
+        screenChunks = self.screen.get_width() // 32 // self.chunkWidth + 2
+        windowChunks = self.chunksBehind + screenChunks + self.chunksAhead
+        self.tileMap = TileMap(windowChunks * self.chunkWidth, self.source.height)
+        spriteCollection = self.sprites.spriteCollection
+        self.paletteIds = np.array([
+            self.tileMap.tileId(spriteCollection.get(name) if name is not None else None, solid, offsetY)
+            for name, solid, offsetY in self.source.palette
+        ], dtype=np.uint8)
+        self.paletteSolid = np.array(
+            [1 if solid else 0 for _, solid, _ in self.source.palette], dtype=np.uint8
+        )
+        self.spawnCount = self.source.spawnCount
+        self.chunks.clear()
+        self.animatedTiles = {}
+        self.mobEngine.tilesChanged()
+        wanted = self.wantedChunks(0)
+        total = 1.0 + len(wanted)
+        yield 1 / total
+        for done in self.updateResidency(wanted):
+            yield (1 + done) / total
+
+    def wantedChunks(self, cameraPosX):
+        visible = self.visibleChunks(cameraPosX)
+        return range(
+            max(0, visible.start - self.chunksBehind),
+            min(self.source.chunkCount, visible.stop + self.chunksAhead),
+        )
+
+    def updateResidency(self, wanted):
+        # unloads the chunks that are no longer wanted, then loads the new
+        # ones, yielding after each; their entities spawn in spawn id order
+        unloaded = [index for index in self.residentChunks if index not in wanted]
+        for index in unloaded:
+            self.unloadChunk(index)
+        if unloaded:
+            self.despawnOutside(wanted)
+        self.tileMap.scroll(wanted.start * self.chunkWidth)
+        spawns = []
+        done = 0
+        for index in wanted:
+            if index not in self.residentChunks:
+                spawns.extend(self.loadChunk(index))
+                done += 1
+                yield done
+        self.residentChunks = wanted
+        for spawn in sorted(spawns):
+            self.spawn(spawn)
+
+    def loadChunk(self, index):
+        ids, spawns = self.source.chunk(index)
+        first = index * self.chunkWidth - self.tileMap.originX
+        last = first + ids.shape[1]
+        self.tileMap.grid[:, first:last] = self.paletteIds[ids]
+        self.tileMap.solidGrid[:, first:last] = self.paletteSolid[ids]
+        return spawns
+
+    def unloadChunk(self, index):
+        self.chunks.pop(index, None)
+        self.animatedTiles.pop(index, None)
+
+    def despawnOutside(self, resident):
+        # entities spawned while playing, e.g. mushrooms from boxes, have
+        # no spawn to come back from; they stay, asleep, and their chunk
+        # is always loaded again before they wake
+        for entity in list(self.spawnIds):
+            if entity.rect.left // 32 // self.chunkWidth not in resident:
+                self.despawnEntity(entity)
+
+    def spawn(self, spawn):
+        spawnId, kind = spawn[0], spawn[1]
+        if spawnId in self.removedSpawns or spawnId in self.spawnedEntities:
+            return
+        spawners = {
+            "CoinBox": self.addCoinBox,
+            "Goomba": self.addGoomba,
+            "Koopa": self.addKoopa,
+            "coin": self.addCoin,
+            "coinBrick": self.addCoinBrick,
+            "RandomBox": self.addRandomBox,
+            "Meloni": self.addMeloni,
+        }
+        spawners[kind](*spawn[2:], spawnId=spawnId)
+        if spawnId in self.usedSpawns:
+            self.spawnedEntities[spawnId].markUsed()
+
+    def update(self, cam):
+        # one simulation step; drawing happens separately in drawLevel
+        profiler.begin("entities")
+        wanted = self.wantedChunks(cam.pos.x)
+        if wanted != self.residentChunks:
+            for _ in self.updateResidency(wanted):
+                pass
+        for index in self.visibleChunks(cam.pos.x):
+            for x, y in self.animatedTiles.get(index, ()):
+                self.tileMap.spriteAt(x, y).animation.update()
+        self.updateEntities(cam)
+        profiler.end("entities")
 
     def updateEntities(self, cam):
-        for entity in self.entityList:
+        self.updateActivation(cam)
+        self.entityGrid.rebuild(self.awakeEntities)
+        self.shellGrid.rebuild([entity for entity in self.awakeEntities if entity.bouncing])
+        for entity in list(self.awakeEntities):
+            entity.beginStep()
             entity.update(cam)
             if entity.alive is None:
-                self.entityList.remove(entity)
-
-    def drawLevel(self, camera):
-        try:
-            for y in range(0, 15):
-                for x in range(0 - int(camera.pos.x + 1), 20 - int(camera.pos.x - 1)):
-                    if self.level[y][x].sprite is not None:
-                        if self.level[y][x].sprite.redrawBackground:
-                            self.screen.blit(
-                                self.sprites.spriteCollection.get("sky").image,
-                                ((x + camera.pos.x) * 32, y * 32),
-                            )
-                        self.level[y][x].sprite.drawSprite(
-                            x + camera.pos.x, y, self.screen
-                        )
-            self.updateEntities(camera)
-        except IndexError:
-            return
+                self.removeEntity(entity)
+        # mobs queued their walk and their shell test while updating
+        self.mobEngine.step()
 
-    def addCloudSprite(self, x, y):
-        try:
-            for yOff in range(0, 2):
-                for xOff in range(0, 3):
-                    self.level[y + yOff][x + xOff] = Tile(
-                        self.sprites.spriteCollection.get("cloud{}_{}".format(yOff + 1, xOff + 1)), None, )
-        except IndexError:
-            return
+    def activationColumns(self, cam):
+        left = int(-cam.x)
+        return (
+            left // 32 - self.activationMargin,
+            (left + self.screen.get_width()) // 32 + self.activationMargin,
+        )
 
-    def addPipeSprite(self, x, y, length=2):
-        try:
-            # add pipe head
-            self.level[y][x] = Tile(
-                self.sprites.spriteCollection.get("pipeL"),
-                pygame.Rect(x * 32, y * 32, 32, 32),
-            )
-            self.level[y][x + 1] = Tile(
-                self.sprites.spriteCollection.get("pipeR"),
-                pygame.Rect((x + 1) * 32, y * 32, 32, 32),
-            )
-            # add pipe body
-            for i in range(1, length + 20):
-                self.level[y + i][x] = Tile(
-                    self.sprites.spriteCollection.get("pipe2L"),
-                    pygame.Rect(x * 32, (y + i) * 32, 32, 32),
-                )
-                self.level[y + i][x + 1] = Tile(
-                    self.sprites.spriteCollection.get("pipe2R"),
-                    pygame.Rect((x + 1) * 32, (y + i) * 32, 32, 32),
-                )
-        except IndexError:
-            return
+    def updateActivation(self, cam):
+        first, last = self.activationColumns(cam)
+        awake = []
+        mobs = self.mobEngine.slots
+        for entity in self.awakeEntities:
+            if entity in mobs:
+                awake.append(entity)
+            elif (entity.rect.right - 1) // 32 < first or entity.rect.left // 32 > last:
+                self.sleepingEntities.insert(entity)
+            else:
+                awake.append(entity)
+        woken = self.sleepingEntities.queryColumns(first, last)
+        for entity in woken:
+            self.sleepingEntities.remove(entity)
+            awake.append(entity)
+        # mobs wake as soon as they spawn
+        woken.extend(self.wakingEntities)
+        awake.extend(self.wakingEntities)
+        self.wakingEntities = []
+        if woken:
+            # keep the update order the entities were spawned in
+            awake.sort(key=self.spawnOrder.__getitem__)
+        self.awakeEntities = awake
 
-    def addBushSprite(self, x, y):
-        try:
-            self.level[y][x] = Tile(self.sprites.spriteCollection.get("bush_1"), None)
-            self.level[y][x + 1] = Tile(
-                self.sprites.spriteCollection.get("bush_2"), None
-            )
-            self.level[y][x + 2] = Tile(
-                self.sprites.spriteCollection.get("bush_3"), None
+    def visibleChunks(self, cameraPosX):
+        screenColumns = -(-self.screen.get_width() // 32)
+        firstChunk = max(0, int(-cameraPosX) // self.chunkWidth)
+        lastChunk = min(self.source.chunkCount - 1, (int(-cameraPosX) + screenColumns) // self.chunkWidth)
+        return range(firstChunk, lastChunk + 1)
+
+    def drawLevel(self, camera, alpha=1.0):
+        profiler.begin("tiles")
+        cameraX = camera.drawX(alpha)
+        if cameraX != self.lastCameraX:
+            # scrolling moves every pixel on screen
+            self.lastCameraX = cameraX
+            dirtyRects.invalidate()
+        for index in self.visibleChunks(camera.pos.x):
+            # floor matches where single tiles used to land on screen
+            self.screen.blit(
+                self.getChunk(index),
+                (math.floor(index * self.chunkWidth * 32 + cameraX), 0),
             )
-        except IndexError:
-            return
+            for x, y in self.animatedTiles.get(index, ()):
+                dimensions = (x * 32 + cameraX, y * 32)
+                self.screen.blit(self.tileMap.spriteAt(x, y).animation.image, dimensions)
+                dirtyRects.add(dimensions + (32, 32))
+        profiler.end("tiles")
+        profiler.begin("entities")
+        for entity in self.awakeEntities:
+            dirtyRects.add(entity.drawArea(camera, alpha))
+            entity.draw(camera, alpha)
+        profiler.end("entities")
+
+    def getChunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            chunk = self.bakeChunk(index)
+            self.chunks[index] = chunk
+            if len(self.chunks) > self.maxChunks:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(index)
+        return chunk
 
-    def addCoinBox(self, x, y):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+    def bakeChunk(self, index):
+        sky = self.sprites.spriteCollection.get("sky").image
+        firstColumn = index * self.chunkWidth
+        columns = range(firstColumn, min(firstColumn + self.chunkWidth, self.levelLength))
+        chunk = pygame.Surface((self.chunkWidth * 32, self.tileMap.height * 32))
+        animated = []
+        for y in range(self.tileMap.height):
+            for x in columns:
+                sprite = self.tileMap.spriteAt(x, y)
+                dimensions = ((x - firstColumn) * 32, y * 32)
+                # boxes have no sprite, their entity draws over the sky
+                if sprite is None or sprite.redrawBackground:
+                    chunk.blit(sky, dimensions)
+                if sprite is None:
+                    continue
+                if sprite.animation is not None:
+                    animated.append((x, y))
+                else:
+                    chunk.blit(sprite.image, dimensions)
+        self.animatedTiles[index] = animated
+        return chunk
+
+    def addEntity(self, entity, spawnId=None):
+        # new entities sleep until the next activation pass
+        if spawnId is None:
+            self.spawnOrder[entity] = self.spawnCount
+            self.spawnCount += 1
+        else:
+            self.spawnOrder[entity] = spawnId
+            self.spawnIds[entity] = spawnId
+            self.spawnedEntities[spawnId] = entity
+        self.entityList.append(entity)
+        if entity in self.mobEngine.slots:
+            self.wakingEntities.append(entity)
+        else:
+            self.sleepingEntities.insert(entity)
+
+    def removeEntity(self, entity):
+        # gone for good: its spawn is not repeated when the chunk reloads
+        spawnId = self.spawnIds.get(entity)
+        if spawnId is not None:
+            self.removedSpawns.add(spawnId)
+        self.dropEntity(entity)
+        entity.release()
+
+    def despawnEntity(self, entity):
+        # its chunk was unloaded; it spawns again with the chunk unless it
+        # was killed, like a koopa hit by a shell, which stays dead
+        spawnId = self.spawnIds.get(entity)
+        if spawnId is not None and entity.alive is False and not entity.bouncing:
+            self.removedSpawns.add(spawnId)
+        elif spawnId is not None and getattr(entity, "triggered", False):
+            self.usedSpawns.add(spawnId)
+        self.dropEntity(entity)
+        entity.release()
+
+    def dropEntity(self, entity):
+        spawnId = self.spawnIds.pop(entity, None)
+        if spawnId is not None:
+            del self.spawnedEntities[spawnId]
+        self.entityList.remove(entity)
+        if entity in self.awakeEntities:
+            self.awakeEntities.remove(entity)
+        if entity in self.wakingEntities:
+            self.wakingEntities.remove(entity)
+        self.sleepingEntities.remove(entity)
+        self.entityGrid.remove(entity)
+        self.shellGrid.remove(entity)
+        self.mobEngine.remove(entity)
+        del self.spawnOrder[entity]
+
+    def addCoinBox(self, x, y, spawnId=None):
+        self.addEntity(
             CoinBox(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -157,12 +357,12 @@ class Level:
                 y,
                 self.sound,
                 self.dashboard,
-            )
+            ),
+            spawnId,
         )
 
-    def addRandomBox(self, x, y, item):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+    def addRandomBox(self, x, y, item, spawnId=None):
+        self.addEntity(
             RandomBox(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -172,15 +372,15 @@ class Level:
                 self.sound,
                 self.dashboard,
                 self
-            )
+            ),
+            spawnId,
         )
 
-    def addCoin(self, x, y):
-        self.entityList.append(Coin(self.screen, self.sprites.spriteCollection, x, y))
+    def addCoin(self, x, y, spawnId=None):
+        self.addEntity(Coin(self.screen, self.sprites.spriteCollection, x, y), spawnId)
 
-    def addCoinBrick(self, x, y):
-        self.level[y][x] = Tile(None, pygame.Rect(x * 32, y * 32 - 1, 32, 32))
-        self.entityList.append(
+    def addCoinBrick(self, x, y, spawnId=None):
+        self.addEntity(
             CoinBrick(
                 self.screen,
                 self.sprites.spriteCollection,
@@ -188,23 +388,26 @@ class Level:
                 y,
                 self.sound,
                 self.dashboard
-            )
+            ),
+            spawnId,
         )
 
-    def addGoomba(self, x, y):
-        self.entityList.append(
-            Goomba(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
+    def addGoomba(self, x, y, spawnId=None):
+        self.addEntity(
+            Goomba(self.screen, self.sprites.spriteCollection, x, y, self, self.sound),
+            spawnId,
         )
 
-    def addKoopa(self, x, y):
-        self.entityList.append(
-            Koopa(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
+    def addKoopa(self, x, y, spawnId=None):
+        self.addEntity(
+            Koopa(self.screen, self.sprites.spriteCollection, x, y, self, self.sound),
+            spawnId,
         )
 
     def addRedMushroom(self, x, y):
-        self.entityList.append(
+        self.addEntity(
             RedMushroom(self.screen, self.sprites.spriteCollection, x, y, self, self.sound)
         )
 
-    def addMeloni(self, x, y):
-        self.entityList.append(Meloni(self.screen, self.sprites.spriteCollection, x, y))
+    def addMeloni(self, x, y, spawnId=None):
+        self.addEntity(Meloni(self.screen, self.sprites.spriteCollection, x, y), spawnId)
@@ -0,0 +1,282 @@
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from classes import CacheFile
+from classes.TileMap import TileMap
+
+# Levels are authored as one JSON file (./levels/<name>.json) and compiled
+# into one binary file (./cache/levels/<name>.lvl) that the game maps into
+# memory, so loading is a few array views instead of parsing JSON, and
+# only the chunks of chunkWidth columns around the camera are ever
+# expanded. The file is, little endian:
+#
+#   header          magic, version, size and mtime of the JSON it was
+#                   compiled from, length, height, chunk width and count,
+#                   palette, spawn and name table sizes
+#   names           NUL separated sprite and item names
+#   palette         [name, solid, offsetY] per tile id, name -1 for none
+#   tiles           length x height tile ids, column after column, so the
+#                   columns of a chunk are one slice
+#   chunk index     first spawn of each chunk, and the spawn count
+#   spawns          [spawn id, kind, column, row, item name] sorted by chunk
+#
+# Spawn ids follow the order entities were always created in. Levels are
+# recompiled when the JSON changes, or ahead of time with:
+# python -m classes.LevelChunks
+
+cacheDir = "./cache/levels"
+magic = b"MLVL"
+version = 5
+chunkWidth = 8
+header = struct.Struct("<4sHQqIHHIHII")
+paletteRecord = np.dtype([("name", "<i2"), ("solid", "u1"), ("offsetY", "<i2")])
+spawnRecord = np.dtype(
+    [("id", "<u4"), ("kind", "u1"), ("column", "<i4"), ("row", "<i2"), ("item", "<i2")]
+)
+spawnKinds = ["CoinBox", "Goomba", "Koopa", "coin", "coinBrick", "RandomBox", "Meloni"]
+# goombas and koopas are created with their coordinates the other way round
+swappedKinds = ("Goomba", "Koopa")
+
+
+def sourcePath(levelName):
+    return "./levels/{}.json".format(levelName)
+
+
+def compiledPath(levelName):
+    return os.path.join(cacheDir, "{}.lvl".format(levelName))
+
+
+def sourceStamp(levelName):
+    stat = os.stat(sourcePath(levelName))
+    return stat.st_size, stat.st_mtime_ns
+
+
+def addCloud(tileMap, x, y):
+    try:
+        for yOff in range(0, 2):
+            for xOff in range(0, 3):
+                tileMap.set(x + xOff, y + yOff, "cloud{}_{}".format(yOff + 1, xOff + 1))
+    except IndexError:
+        return
+
+
+def addPipe(tileMap, x, y, length=2):
+    try:
+        # add pipe head
+        tileMap.set(x, y, "pipeL", True)
+        tileMap.set(x + 1, y, "pipeR", True)
+        # add pipe body
+        for i in range(1, length + 20):
+            tileMap.set(x, y + i, "pipe2L", True)
+            tileMap.set(x + 1, y + i, "pipe2R", True)
+    except IndexError:
+        return
+
+
+def addBush(tileMap, x, y):
+    try:
+        tileMap.set(x, y, "bush_1")
+        tileMap.set(x + 1, y, "bush_2")
+        tileMap.set(x + 2, y, "bush_3")
+    except IndexError:
+        return
+
+
+def buildTiles(data):
+    # the whole level with sprite names for tiles; only done when building
+    columns = range(*data["level"]["layers"]["sky"]["x"])
+    skyRows = range(*data["level"]["layers"]["sky"]["y"])
+    groundRows = range(*data["level"]["layers"]["ground"]["y"])
+    tileMap = TileMap(len(columns), len(skyRows) + len(groundRows))
+    for x in columns:
+        for row in range(len(skyRows)):
+            tileMap.set(x, row, "sky")
+        for row, y in enumerate(groundRows, len(skyRows)):
+            # ground collides one row above its layer coordinate
+            tileMap.set(x, row, "ground", True, (y - 1 - row) * 32)
+    objects = data["level"]["objects"]
+    for x, y in objects["bush"]:
+        addBush(tileMap, x, y)
+    for x, y in objects["cloud"]:
+        addCloud(tileMap, x, y)
+    for x, y, z in objects["pipe"]:
+        addPipe(tileMap, x, y, z)
+    for x, y in objects["sky"]:
+        tileMap.set(x, y, "sky")
+    for x, y in objects["ground"]:
+        tileMap.set(x, y, "ground", True)
+    return tileMap
+
+
+def buildSpawns(data, tileMap):
+    # (column, kind, arguments) in creation order; blocks also get their
+    # solid tile. Goombas and koopas are listed as [y, x].
+    spawns = []
+    try:
+        entities = data["level"]["entities"]
+        for x, y in entities["CoinBox"]:
+            tileMap.set(x, y, None, True, -1)
+            spawns.append((x, "CoinBox", [x, y]))
+        for y, x in entities["Goomba"]:
+            spawns.append((x, "Goomba", [y, x]))
+        for y, x in entities["Koopa"]:
+            # a koopa stands one column left of its x
+            spawns.append((x - 1, "Koopa", [y, x]))
+        for x, y in entities["coin"]:
+            spawns.append((x, "coin", [x, y]))
+        for x, y in entities["coinBrick"]:
+            tileMap.set(x, y, None, True, -1)
+            spawns.append((x, "coinBrick", [x, y]))
+        for x, y, item in entities["RandomBox"]:
+            tileMap.set(x, y, None, True, -1)
+            spawns.append((x, "RandomBox", [x, y, item]))
+        # the goal; levels that do not place it get it near their end
+        for x, y in entities.get("Meloni", [[data["length"] - 2, 12]]):
+            spawns.append((x, "Meloni", [x, y]))
+    except KeyError:
+        # if no entities in Level
+        pass
+    return spawns
+
+
+def compileLevel(levelName):
+    with open(sourcePath(levelName)) as jsonData:
+        data = json.load(jsonData)
+    tileMap = buildTiles(data)
+    spawns = buildSpawns(data, tileMap)
+    length = data["length"]
+    chunkCount = (length + chunkWidth - 1) // chunkWidth
+
+    names = []
+    nameIds = {}
+
+    def nameId(name):
+        if name is None:
+            return -1
+        if name not in nameIds:
+            nameIds[name] = len(names)
+            names.append(name)
+        return nameIds[name]
+
+    palette = np.array(
+        [(nameId(tileType.sprite), tileType.solid, tileType.offsetY) for tileType in tileMap.palette],
+        dtype=paletteRecord,
+    )
+    tiles = np.zeros((length, tileMap.height), dtype=np.uint8)
+    columns = min(length, tileMap.width)
+    tiles[:columns] = tileMap.grid[:, :columns].T
+
+    records = []
+    for spawnId, (column, kind, arguments) in enumerate(spawns):
+        if kind in swappedKinds:
+            row, x = arguments
+        else:
+            x, row = arguments[:2]
+        item = nameId(arguments[2]) if len(arguments) > 2 else -1
+        records.append((spawnId, spawnKinds.index(kind), x, row, item))
+    spawnTable = np.array(records, dtype=spawnRecord)
+    # spawns belong to the chunk of the column they stand in
+    standing = np.array([column for column, _, _ in spawns], dtype=np.int64)
+    chunkOf = np.clip(standing // chunkWidth, 0, chunkCount - 1)
+    order = np.argsort(chunkOf, kind="stable")
+    spawnTable = spawnTable[order]
+    chunkIndex = np.searchsorted(chunkOf[order], np.arange(chunkCount + 1)).astype("<u4")
+
+    nameTable = "\0".join(names).encode("utf-8")
+    size, mtime = sourceStamp(levelName)
+    return b"".join([
+        header.pack(
+            magic, version, size, mtime, length, tileMap.height, chunkWidth, chunkCount,
+            len(palette), len(spawnTable), len(nameTable),
+        ),
+        nameTable,
+        palette.tobytes(),
+        tiles.tobytes(),
+        chunkIndex.tobytes(),
+        spawnTable.tobytes(),
+    ])
+
+
+def save(levelName, compiled):
+    return CacheFile.write(compiledPath(levelName), [compiled])
+
+
+def openCompiled(levelName):
+    # the compiled level mapped into memory, None if missing or stale
+    try:
+        with open(compiledPath(levelName), "rb") as infile:
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    fields = CacheFile.unpackHeader(data, header, magic, version)
+    if fields is None or fields[0:2] != sourceStamp(levelName):
+        return None
+    return data
+
+
+class ChunkedLevel:
+    def __init__(self, levelName):
+        self.levelName = levelName
+        data = openCompiled(levelName)
+        if data is None:
+            data = compileLevel(levelName)
+            # a read-only install keeps the compiled level in memory
+            save(levelName, data)
+        (
+            _, _, _, _, self.length, self.height, self.chunkWidth, self.chunkCount,
+            paletteCount, self.spawnCount, namesSize,
+        ) = header.unpack_from(data)
+        offset = header.size
+        names = bytes(data[offset:offset + namesSize]).decode("utf-8").split("\0")
+        offset += namesSize
+        palette = np.frombuffer(data, paletteRecord, paletteCount, offset)
+        offset += palette.nbytes
+        self.palette = [
+            [names[name] if name >= 0 else None, bool(solid), int(offsetY)]
+            for name, solid, offsetY in palette.tolist()
+        ]
+        # views into the file; nothing is copied until a chunk loads
+        self.tiles = np.frombuffer(data, np.uint8, self.length * self.height, offset)
+        self.tiles = self.tiles.reshape(self.length, self.height)
+        offset += self.tiles.nbytes
+        self.chunkIndex = np.frombuffer(data, "<u4", self.chunkCount + 1, offset)
+        offset += self.chunkIndex.nbytes
+        self.spawns = np.frombuffer(data, spawnRecord, self.spawnCount, offset)
+        self.names = names
+
+    def chunk(self, index):
+        # palette ids as a height x columns array, and the chunk's spawns
+        # as [spawn id, kind, arguments...]
+        first = index * self.chunkWidth
+        ids = self.tiles[first:first + self.chunkWidth].T
+        spawns = []
+        for spawnId, kind, column, row, item in self.spawns[
+            self.chunkIndex[index]:self.chunkIndex[index + 1]
+        ].tolist():
+            kind = spawnKinds[kind]
+            if kind in swappedKinds:
+                arguments = [row, column]
+            else:
+                arguments = [column, row]
+            if item >= 0:
+                arguments.append(self.names[item])
+            spawns.append([spawnId, kind] + arguments)
+        return ids, spawns
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or sorted(
+        os.path.splitext(name)[0] for name in os.listdir("./levels") if name.endswith(".json")
+    )
+    for levelName in names:
+        compiled = compileLevel(levelName)
+        save(levelName, compiled)
+        level = ChunkedLevel(levelName)
+        print("{}: {} bytes, {} chunks of {} columns, {} spawns".format(
+            levelName, len(compiled), level.chunkCount, level.chunkWidth, level.spawnCount
+        ))
@@ -0,0 +1,33 @@
+import time
+
+
+class LevelLoader:
+    # Runs Level.loadSteps a little at a time, at most budget seconds per
+    # update(), so the menu or the level being played keeps its frame rate
+    # while another level loads.
+    def __init__(self, level, levelName, budget=0.004):
+        self.level = level
+        self.levelName = levelName
+        self.budget = budget
+        self.steps = level.loadSteps(levelName)
+        self.progress = 0.0
+        self.done = False
+
+    def update(self):
+        deadline = time.perf_counter() + self.budget
+        while not self.done:
+            try:
+                self.progress = next(self.steps)
+            except StopIteration:
+                self.progress = 1.0
+                self.done = True
+            if time.perf_counter() >= deadline:
+                break
+        return self.done
+
+    def finish(self):
+        for self.progress in self.steps:
+            pass
+        self.progress = 1.0
+        self.done = True
+        return self.level
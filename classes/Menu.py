@@ -1,10 +1,31 @@
 import json
 import sys
 import os
+import re
 import pygame
 
+from classes.DirtyRects import dirtyRects
+from classes.LevelLoader import LevelLoader
 from classes.Spritesheet import Spritesheet
 
+# the level files, read once
+levelNames = []
+
+
+def levelSortKey(levelName):
+    # numbers compare as numbers, so Level1-10 comes after Level1-9
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", levelName)]
+
+
+def findLevelNames():
+    if not levelNames:
+        names = []
+        for r, d, f in os.walk("./levels"):
+            for file in f:
+                names.append(file.split(".")[0])
+        levelNames.extend(sorted(names, key=levelSortKey))
+    return levelNames
+
 
 class Menu:
     def __init__(self, screen, dashboard, level, sound):
@@ -21,6 +42,10 @@ class Menu:
         self.inChoosingLevel = False
         self.dashboard = dashboard
         self.levelCount = 0
+        # the menu is static, it is only drawn again after input
+        self.redraw = True
+        # set while the chosen level loads over several frames
+        self.loader = None
         self.spritesheet = Spritesheet("./img/title_screen.png")
         self.menu_banner = self.spritesheet.image_at(
             0,
@@ -39,13 +64,27 @@ class Menu:
         )
         self.loadSettings("./settings.json")
 
+    def release(self):
+        self.spritesheet.release()
+
     def update(self, events):
+        if self.loader is not None:
+            # input is ignored until the level is ready
+            if self.loader.update():
+                self.dashboard.startLevel(self.loader.levelName)
+                self.loader = None
+                self.start = True
+            else:
+                self.drawLoading(self.loader.progress)
+            return
         self.checkInput(events)
-        if self.inChoosingLevel:
+        if self.inChoosingLevel or not self.redraw:
             return
+        self.redraw = False
+        dirtyRects.invalidate()
 
         self.drawMenuBackground()
-        self.dashboard.update()
+        self.dashboard.draw()
 
         if not self.inSettings:
             self.drawMenu()
@@ -134,6 +173,14 @@ class Menu:
         )
         self.screen.blit(self.level.sprites.spriteCollection.get("goomba-1").image, (18.5*32, 12*32))
 
+    def drawLoading(self, progress):
+        dirtyRects.invalidate()
+        self.drawMenuBackground(False)
+        dots = "." * (pygame.time.get_ticks() // 250 % 4)
+        self.dashboard.drawText("LOADING" + dots, 230, 200, 24)
+        pygame.draw.rect(self.screen, (255, 255, 255), (170, 250, 300, 20), 2)
+        pygame.draw.rect(self.screen, (255, 255, 255), (174, 254, int(292 * progress), 12))
+
     def drawSettings(self):
         self.drawDot()
         self.dashboard.drawText("MUSIC", 180, 280, 24)
@@ -161,6 +208,7 @@ class Menu:
         pygame.draw.rect(self.screen, color, (x+width, y, thickness, width+thickness))
 
     def drawLevelChooser(self):
+        dirtyRects.invalidate()
         j = 0
         offset = 75
         textOffset = 90
@@ -178,27 +226,30 @@ class Menu:
                 j += 1
 
     def loadLevelNames(self):
-        files = []
-        res = []
-        for r, d, f in os.walk("./levels"):
-            for file in f:
-                files.append(os.path.join(r, file))
-        for f in files:
-            res.append(os.path.split(f)[1].split(".")[0])
+        res = findLevelNames()
         self.levelCount = len(res)
         return res
 
+    def startLevel(self, levelName):
+        self.loader = LevelLoader(self.level, levelName)
+
+    def nextLevelName(self, levelName):
+        levelNames = findLevelNames()
+        if levelName in levelNames and levelName != levelNames[-1]:
+            return levelNames[levelNames.index(levelName) + 1]
+        return None
+
     def checkInput(self, events):
         for event in events:
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
             if event.type == pygame.KEYDOWN:
+                self.redraw = True
                 if event.key == pygame.K_ESCAPE:
                     if self.inChoosingLevel or self.inSettings:
                         self.inChoosingLevel = False
                         self.inSettings = False
+                        spritesheet = self.spritesheet
                         self.__init__(self.screen, self.dashboard, self.level, self.sound)
+                        spritesheet.release()
                     else:
                         pygame.quit()
                         sys.exit()
@@ -227,11 +278,7 @@ class Menu:
                 elif event.key == pygame.K_RETURN:
                     if self.inChoosingLevel:
                         self.inChoosingLevel = False
-                        self.dashboard.state = "start"
-                        self.dashboard.time = 0
-                        self.level.loadLevel(self.levelNames[self.currSelectedLevel-1])
-                        self.dashboard.levelName = self.levelNames[self.currSelectedLevel-1].split("Level")[1]
-                        self.start = True
+                        self.startLevel(self.levelNames[self.currSelectedLevel-1])
                         return
                     if not self.inSettings:
                         if self.state == 0:
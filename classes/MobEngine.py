@@ -0,0 +1,208 @@
+import numpy as np
+
+# Gravity, walking, direction flips and tile collision for every walking
+# mob (goombas, koopas, red mushrooms) in one vectorized pass per frame.
+# The engine owns velocity, direction and speed; LeftRightWalkTrait and
+# MobVelocity are views into its arrays. Rects stay pygame.Rect because
+# drawing and the entity collisions need them; they are read before each
+# pass and written back in update order.
+
+# cells tested around a mob: 3 rows by 2 columns from its top left tile
+cellOffsets = [(row, column) for row in range(3) for column in range(2)]
+
+
+def roundHalfAway(values):
+    # how pygame.Rect rounds float coordinates
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+
+class MobVelocity:
+    def __init__(self, engine, slot):
+        self.engine = engine
+        self.slot = slot
+
+    @property
+    def x(self):
+        return float(self.engine.velX[self.slot])
+
+    @x.setter
+    def x(self, value):
+        self.engine.velX[self.slot] = value
+
+    @property
+    def y(self):
+        return float(self.engine.velY[self.slot])
+
+    @y.setter
+    def y(self, value):
+        self.engine.velY[self.slot] = value
+
+
+class MobEngine:
+    def __init__(self, levelObj, capacity=64):
+        self.levelObj = levelObj
+        self.entities = [None] * capacity
+        self.slots = {}
+        self.freeSlots = list(range(capacity - 1, -1, -1))
+        self.velX = np.zeros(capacity)
+        self.velY = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.direction = np.zeros(capacity, dtype=np.int64)
+        self.speed = np.zeros(capacity)
+        self.width = np.zeros(capacity, dtype=np.int64)
+        self.height = np.zeros(capacity, dtype=np.int64)
+        self.queued = []
+        # walks and shell tests in the order the mobs were updated
+        self.turns = []
+        self.tilesDirty = True
+        self.tiles = None
+        self.solidTable = None
+        self.offsetTable = None
+
+    def add(self, entity, direction, speed):
+        if not self.freeSlots:
+            self.grow()
+        slot = self.freeSlots.pop()
+        self.entities[slot] = entity
+        self.slots[entity] = slot
+        self.direction[slot] = direction
+        self.speed[slot] = speed
+        self.velX[slot] = speed * direction
+        self.velY[slot] = entity.vel.y
+        self.gravity[slot] = entity.gravity if entity.obeyGravity else 0
+        self.width[slot] = entity.rect.width
+        self.height[slot] = entity.rect.height
+        entity.vel = MobVelocity(self, slot)
+        return slot
+
+    def remove(self, entity):
+        slot = self.slots.pop(entity, None)
+        if slot is None:
+            return
+        self.entities[slot] = None
+        self.freeSlots.append(slot)
+
+    def grow(self):
+        capacity = len(self.entities)
+        self.entities.extend([None] * capacity)
+        self.freeSlots.extend(range(2 * capacity - 1, capacity - 1, -1))
+        for name in ("velX", "velY", "gravity", "direction", "speed", "width", "height"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+
+    def queue(self, slot):
+        # the mob walks this frame; applied in step()
+        self.queued.append(slot)
+        self.turns.append((self.entities[slot], True))
+
+    def queueCollision(self, mob):
+        # the mob tests for shells this frame, in step()
+        self.turns.append((mob, False))
+
+    def tilesChanged(self):
+        self.tilesDirty = True
+
+    def buildTiles(self):
+        # mobs walk on the whole compiled level, not just the loaded
+        # window, so off screen ones find the tiles they always did; the
+        # ids are a view into the mapped file
+        source = self.levelObj.source
+        self.tiles = source.tiles
+        self.solidTable = np.array([solid for _, solid, _ in source.palette], dtype=bool)
+        self.offsetTable = np.array([offsetY for _, _, offsetY in source.palette], dtype=np.int64)
+        self.tilesDirty = False
+
+    def firstHit(self, x, y, w, h):
+        # rect of the first solid tile, in row then column order, that
+        # overlaps each mob, and whether the rows run past the map bottom
+        length, height = self.tiles.shape
+        row0 = np.floor_divide(y, 32)
+        column0 = np.floor_divide(x, 32)
+        rowsValid = row0 + 2 < height
+        hits = np.zeros((len(x), len(cellOffsets)), dtype=bool)
+        tops = np.zeros((len(x), len(cellOffsets)), dtype=np.int64)
+        lefts = np.zeros((len(x), len(cellOffsets)), dtype=np.int64)
+        for k, (dy, dx) in enumerate(cellOffsets):
+            row = row0 + dy
+            column = column0 + dx
+            inside = rowsValid & (row >= 0) & (column >= 0) & (column < length)
+            ids = self.tiles[np.where(inside, column, 0), np.where(inside, row, 0)]
+            top = row * 32 + self.offsetTable[ids]
+            left = column * 32
+            hits[:, k] = (
+                inside
+                & self.solidTable[ids]
+                & (x < left + 32)
+                & (left < x + w)
+                & (y < top + 32)
+                & (top < y + h)
+            )
+            tops[:, k] = top
+            lefts[:, k] = left
+        first = hits.argmax(axis=1)
+        pick = np.arange(len(x))
+        return rowsValid, hits.any(axis=1), tops[pick, first], lefts[pick, first]
+
+    def step(self):
+        # the walks are worked out together, but each mob's new position
+        # is only set at its turn: a shell test sees the mobs updated
+        # before it moved and the later ones not yet, as when every mob
+        # moved on its own during its update
+        moves = self.walk() if self.queued else {}
+        turns, self.turns = self.turns, []
+        for mob, walks in turns:
+            if not walks:
+                mob.checkEntityCollision()
+                continue
+            # onGround as Collider.moveY leaves it
+            mob.rect.x, mob.rect.y, mob.onGround, dead = moves[mob]
+            if dead:
+                mob.alive = None
+
+    def walk(self):
+        if self.tilesDirty:
+            self.buildTiles()
+        slots = np.array(self.queued, dtype=np.int64)
+        self.queued = []
+        mobs = [self.entities[slot] for slot in slots.tolist()]
+        x = np.array([mob.rect.x for mob in mobs], dtype=np.int64)
+        y = np.array([mob.rect.y for mob in mobs], dtype=np.int64)
+        w = self.width[slots]
+        h = self.height[slots]
+
+        # gravity and LeftRightWalkTrait.update
+        velY = self.velY[slots] + self.gravity[slots]
+        direction = self.direction[slots]
+        direction = np.where(self.velX[slots] == 0, -direction, direction)
+        velX = self.speed[slots] * direction
+
+        # vertical move and tile collision at the new position
+        y = roundHalfAway(y + velY).astype(np.int64)
+        rowsValid, anyHit, top, _ = self.firstHit(x, y, w, h)
+        fellOut = ~rowsValid
+        landed = anyHit & (velY > 0)
+        bumped = anyHit & (velY < 0)
+        y = np.where(landed, top - h, y)
+        y = np.where(bumped, top + 32, y)
+        velY = np.where(anyHit, 0.0, velY)
+
+        # horizontal move; mobs walk at most 4px a frame, well under a
+        # tile, so unlike Collider.moveX this needs no sweep
+        x = roundHalfAway(x + velX).astype(np.int64)
+        levelRight = (self.levelObj.levelLength - 1) * 32
+        atLeft = x < 0
+        atRight = ~atLeft & (x / 32.0 > self.levelObj.levelLength - 1)
+        x = np.where(atLeft, 0, np.where(atRight, levelRight, x))
+        _, anyHit, _, left = self.firstHit(x, y, w, h)
+        anyHit &= ~(atLeft | atRight)
+        x = np.where(anyHit & (velX > 0), left - w, x)
+        x = np.where(anyHit & (velX < 0), left + 32, x)
+        velX = np.where(anyHit | atLeft | atRight, 0.0, velX)
+
+        self.velX[slots] = velX
+        self.velY[slots] = velY
+        self.direction[slots] = direction
+        return {
+            mob: move
+            for mob, move in zip(mobs, zip(x.tolist(), y.tolist(), landed.tolist(), fellOut.tolist()))
+        }
@@ -1,8 +1,8 @@
 import pygame
-import sys
 
+from classes.DirtyRects import dirtyRects
 from classes.Spritesheet import Spritesheet
-from classes.GaussianBlur import GaussianBlur
+from classes.Blur import Blur
 
 class Pause:
     def __init__(self, screen, entity, dashboard):
@@ -10,8 +10,11 @@ class Pause:
         self.entity = entity
         self.dashboard = dashboard
         self.state = 0
+        self.redraw = True
         self.spritesheet = Spritesheet("./img/title_screen.png")
-        self.pause_srfc = GaussianBlur().filter(self.screen, 0, 0, 640, 480)
+        # the blurred game behind the menu, made when the game is paused
+        self.blur = Blur()
+        self.pause_srfc = None
         self.dot = self.spritesheet.image_at(
             0, 150, 2, colorkey=[255, 0, 220], ignoreTileSize=True
         )
@@ -19,12 +22,19 @@ class Pause:
             20, 150, 2, colorkey=[255, 0, 220], ignoreTileSize=True
         )
 
+    def release(self):
+        self.spritesheet.release()
+
     def update(self, events):
-        self.screen.blit(self.pause_srfc, (0, 0))
-        self.dashboard.drawText("PAUSED", 120, 160, 68)
-        self.dashboard.drawText("CONTINUE", 150, 280, 32)
-        self.dashboard.drawText("BACK TO MENU", 150, 320, 32)
-        self.drawDot()
+        if self.redraw:
+            self.redraw = False
+            dirtyRects.invalidate()
+            if self.pause_srfc is not None:
+                self.screen.blit(self.pause_srfc, (0, 0))
+            self.dashboard.drawText("PAUSED", 120, 160, 68)
+            self.dashboard.drawText("CONTINUE", 150, 280, 32)
+            self.dashboard.drawText("BACK TO MENU", 150, 320, 32)
+            self.drawDot()
         # pygame.display.update() removed
         self.checkInput(events)
 
@@ -38,13 +48,13 @@ class Pause:
 
     def checkInput(self, events):
         for event in events:
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
             if event.type == pygame.KEYDOWN:
+                self.redraw = True
                 if event.key == pygame.K_RETURN:
                     if self.state == 0:
                         self.entity.pause = False
+                        # the level is drawn over the whole pause screen
+                        dirtyRects.invalidate()
                     elif self.state == 1:
                         self.entity.restart = True
                 elif event.key == pygame.K_UP:
@@ -55,4 +65,5 @@ class Pause:
                         self.state += 1
 
     def createBackgroundBlur(self):
-        self.pause_srfc = GaussianBlur().filter(self.screen, 0, 0, 640, 480)
+        self.redraw = True
+        self.pause_srfc = self.blur.apply(self.screen)
@@ -0,0 +1,98 @@
+import math
+
+import pygame
+
+from classes.DirtyRects import dirtyRects
+
+# nearest         stretched over the whole window, nearest neighbour
+# smooth          stretched over the whole window, filtered
+# pixel-perfect   the largest whole multiple of the virtual screen that
+#                 fits, centred with black bars around it
+scalingModes = ("nearest", "smooth", "pixel-perfect")
+
+
+class Presenter:
+    # Puts the virtual screen on the window. Frames are scaled straight
+    # into the window surface, or into a subsurface of it when there are
+    # bars, so presenting allocates nothing; the target and its geometry
+    # only change when the window is resized.
+    def __init__(self, virtualScreen, display, scaling="nearest"):
+        if scaling not in scalingModes:
+            raise ValueError("unknown scaling mode {}".format(scaling))
+        self.virtualScreen = virtualScreen
+        self.scaling = scaling
+        self.setDisplay(display)
+
+    def resize(self, size):
+        return self.setDisplay(pygame.display.set_mode(size, pygame.RESIZABLE))
+
+    def viewport(self, display):
+        width, height = self.virtualScreen.get_size()
+        displayWidth, displayHeight = display.get_size()
+        if self.scaling != "pixel-perfect":
+            return pygame.Rect(0, 0, displayWidth, displayHeight)
+        factor = min(displayWidth // width, displayHeight // height)
+        if factor >= 1:
+            size = (width * factor, height * factor)
+        else:
+            # smaller than the virtual screen: fit it, keeping its shape
+            scale = min(displayWidth / float(width), displayHeight / float(height))
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        rect = pygame.Rect((0, 0), size)
+        rect.center = (displayWidth // 2, displayHeight // 2)
+        return rect
+
+    def setDisplay(self, display):
+        self.display = display
+        self.view = self.viewport(display)
+        if self.view.size == display.get_size():
+            self.target = display
+        else:
+            # the bars are filled once, frames only cover the viewport
+            display.fill((0, 0, 0))
+            self.target = display.subsurface(self.view)
+        self.sameSize = self.view.size == self.virtualScreen.get_size()
+        # regions are snapped to a grid whose lines land on whole pixels on
+        # both surfaces, so scaling one region gives the same pixels as
+        # scaling the whole frame
+        width, height = self.virtualScreen.get_size()
+        self.gridX = width // math.gcd(width, self.view.width)
+        self.gridY = height // math.gcd(height, self.view.height)
+        dirtyRects.invalidate()
+        return display
+
+    def present(self):
+        rects = dirtyRects.flush() if dirtyRects.enabled else None
+        if rects is None or (self.scaling == "smooth" and not self.sameSize):
+            # filtering mixes neighbouring pixels, so a smoothly scaled
+            # region would not match the whole frame at its edges
+            self.presentFrame()
+            pygame.display.update()
+        elif rects:
+            pygame.display.update([self.presentRect(rect) for rect in rects])
+
+    def presentFrame(self):
+        if self.sameSize:
+            self.target.blit(self.virtualScreen, (0, 0))
+        elif self.scaling == "smooth":
+            pygame.transform.smoothscale(self.virtualScreen, self.view.size, self.target)
+        else:
+            pygame.transform.scale(self.virtualScreen, self.view.size, self.target)
+
+    def presentRect(self, rect):
+        left = rect.left // self.gridX * self.gridX
+        top = rect.top // self.gridY * self.gridY
+        right = -(-rect.right // self.gridX) * self.gridX
+        bottom = -(-rect.bottom // self.gridY) * self.gridY
+        source = pygame.Rect(left, top, right - left, bottom - top)
+        width, height = self.virtualScreen.get_size()
+        dest = pygame.Rect(
+            left * self.view.width // width,
+            top * self.view.height // height,
+            source.width * self.view.width // width,
+            source.height * self.view.height // height,
+        )
+        pygame.transform.scale(
+            self.virtualScreen.subsurface(source), dest.size, self.target.subsurface(dest)
+        )
+        return dest.move(self.view.topleft)
@@ -0,0 +1,87 @@
+import time
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        # keep every frame for summary(), otherwise only the last one
+        self.recording = False
+        self.lastFrame = {}
+        self.lastFrameTime = 0.0
+        self.phases = []
+        self.samples = {}
+        self.frameTimes = []
+        self.current = {}
+        self.starts = {}
+        self.frameStart = None
+
+    def reset(self):
+        self.phases = []
+        self.samples = {}
+        self.frameTimes = []
+        self.current = {}
+        self.starts = {}
+        self.frameStart = None
+        self.lastFrame = {}
+        self.lastFrameTime = 0.0
+
+    def beginFrame(self):
+        if self.enabled:
+            self.frameStart = time.perf_counter()
+
+    def begin(self, name):
+        if self.enabled:
+            self.starts[name] = time.perf_counter()
+
+    def end(self, name):
+        if self.enabled:
+            start = self.starts.pop(name, None)
+            if start is not None:
+                self.current[name] = self.current.get(name, 0.0) + time.perf_counter() - start
+
+    def endFrame(self):
+        if not self.enabled or self.frameStart is None:
+            return
+        self.lastFrameTime = time.perf_counter() - self.frameStart
+        self.lastFrame = self.current
+        self.current = {}
+        self.frameStart = None
+        if not self.recording:
+            return
+        self.frameTimes.append(self.lastFrameTime)
+        for name, elapsed in self.lastFrame.items():
+            if name not in self.samples:
+                self.phases.append(name)
+                # phases that started late count as 0 on earlier frames
+                self.samples[name] = [0.0] * (len(self.frameTimes) - 1)
+            self.samples[name].append(elapsed)
+        for name in self.phases:
+            if name not in self.lastFrame:
+                self.samples[name].append(0.0)
+
+    def summary(self):
+        res = {"frame": self.stats(self.frameTimes)}
+        for name in self.phases:
+            res[name] = self.stats(self.samples[name])
+        return res
+
+    @staticmethod
+    def stats(values):
+        # milliseconds
+        return {
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "p99": percentile(values, 99) * 1000,
+            "max": max(values) * 1000 if values else 0.0,
+        }
+
+
+profiler = Profiler()
@@ -0,0 +1,100 @@
+from collections import deque
+
+import pygame
+
+from classes.DirtyRects import dirtyRects
+from classes.Profiler import profiler
+
+
+class ProfilerOverlay:
+    stages = [
+        ("tiles", "tiles"),
+        ("entities", "entities"),
+        ("physics", "mario physics"),
+        ("collision", "mario collision"),
+        ("dashboard", "hud"),
+        ("present", "present"),
+    ]
+
+    def __init__(self, screen, history=120, refreshInterval=15, toggleKey=pygame.K_F3):
+        self.screen = screen
+        self.visible = False
+        self.toggleKey = toggleKey
+        self.refreshInterval = refreshInterval
+        self.history = {name: deque(maxlen=history) for name, _ in self.stages}
+        self.frameTimes = deque(maxlen=history)
+        self.frame = 0
+        self.font = None
+        self.panel = None
+        self.graph = None
+        self.graphSize = (history * 2, 60)
+        # top of the graph, in seconds
+        self.graphScale = 1 / 30.0
+
+    def checkInput(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == self.toggleKey:
+                self.toggle()
+
+    def toggle(self):
+        self.visible = not self.visible
+        profiler.enabled = self.visible
+        if self.visible:
+            for values in self.history.values():
+                values.clear()
+            self.frameTimes.clear()
+            self.frame = 0
+            self.refresh()
+
+    def collect(self):
+        # called once per frame, after profiler.endFrame()
+        if not self.visible:
+            return
+        for name, values in self.history.items():
+            values.append(profiler.lastFrame.get(name, 0.0))
+        self.frameTimes.append(profiler.lastFrameTime)
+        self.frame += 1
+        if self.frame % self.refreshInterval == 0:
+            self.refresh()
+
+    def draw(self):
+        if not self.visible:
+            return
+        dirtyRects.add(self.screen.blit(self.panel, (8, 64)))
+        dirtyRects.add(self.screen.blit(self.graph, (8, 64 + self.panel.get_height() + 4)))
+
+    def refresh(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        rows = [("stage (ms)", "avg", "max")]
+        for name, label in self.stages:
+            rows.append(self.formatRow(label, self.history[name]))
+        rows.append(self.formatRow("frame", self.frameTimes))
+
+        lineHeight = self.font.get_linesize()
+        self.panel = pygame.Surface((self.graphSize[0], lineHeight * len(rows) + 8), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+        for i, row in enumerate(rows):
+            for column, x in zip(row, (4, 140, 190)):
+                text = self.font.render(column, True, (255, 255, 255))
+                self.panel.blit(text, (x, 4 + i * lineHeight))
+        self.drawGraph()
+
+    def formatRow(self, label, values):
+        if values:
+            avg = sum(values) / len(values) * 1000
+            peak = max(values) * 1000
+        else:
+            avg = peak = 0.0
+        return label, "{:.2f}".format(avg), "{:.2f}".format(peak)
+
+    def drawGraph(self):
+        width, height = self.graphSize
+        self.graph = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.graph.fill((0, 0, 0, 170))
+        for i, frameTime in enumerate(self.frameTimes):
+            barHeight = min(height, int(frameTime / self.graphScale * height))
+            color = (80, 220, 80) if frameTime <= 1 / 60.0 else (230, 60, 60)
+            pygame.draw.rect(self.graph, color, (i * 2, height - barHeight, 2, barHeight))
+        budget = height - int(1 / 60.0 / self.graphScale * height)
+        pygame.draw.line(self.graph, (255, 255, 0), (0, budget), (width, budget))
@@ -0,0 +1,200 @@
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+from classes.Input import PressedKeys
+
+# Per step input of one play session plus the seed the level was loaded
+# with, so the run can be played back exactly, windowed or headless.
+#
+#   magic, version, seed, level name length, level name,
+#   zlib( frame count, frames )
+#
+# A frame is the held keys as a bit mask, the mouse buttons released that
+# step with the mouse position, and a checksum of the game state after the
+# step. Playback compares checksums and remembers the first frame that
+# differs.
+#
+# Record with: python main.py --record run.replay [--seed N]
+# Play with:   python main.py --replay run.replay
+#              python -m classes.Replay run.replay     (headless)
+
+magic = b"MRPL"
+version = 1
+header = struct.Struct("<4sHIH")
+frameCount = struct.Struct("<I")
+frameRecord = struct.Struct("<HBI")
+mouseRecord = struct.Struct("<hh")
+# pausing does not step the game, so these keep working during playback
+liveKeys = (pygame.K_ESCAPE, pygame.K_F5)
+
+# the keys Input.checkForKeyboardInput reads, one bit each
+replayKeys = [
+    pygame.K_LEFT, pygame.K_h, pygame.K_RIGHT, pygame.K_l,
+    pygame.K_SPACE, pygame.K_UP, pygame.K_k, pygame.K_LSHIFT,
+]
+# Input.checkForMouseInput reacts to these buttons being released
+replayButtons = (1, 3)
+
+
+def keyMask(pressedKeys):
+    mask = 0
+    for bit, key in enumerate(replayKeys):
+        if pressedKeys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def maskKeys(mask):
+    return PressedKeys(key for bit, key in enumerate(replayKeys) if mask & (1 << bit))
+
+
+def stateChecksum(level, mario, dashboard):
+    state = [
+        struct.pack(
+            "<iiiiddiiii", mario.rect.x, mario.rect.y, mario.rect.width, mario.rect.height,
+            mario.vel.x, mario.vel.y, dashboard.points, dashboard.coins,
+            dashboard.time, len(level.entityList),
+        )
+    ]
+    for entity in level.awakeEntities:
+        alive = 0 if entity.alive is None else 1 if entity.alive else 2
+        state.append(struct.pack("<iib", entity.rect.x, entity.rect.y, alive))
+    return zlib.crc32(b"".join(state))
+
+
+class ReplayRecorder:
+    # input source wrapper that remembers what the game read each step
+    def __init__(self, source, levelName, seed):
+        self.source = source
+        self.levelName = levelName
+        self.seed = seed
+        self.frames = []
+        self.keys = 0
+        self.buttons = []
+        self.mousePos = (0, 0)
+
+    def getPressedKeys(self):
+        pressedKeys = self.source.getPressedKeys()
+        self.keys = keyMask(pressedKeys)
+        return pressedKeys
+
+    def getMousePos(self):
+        self.mousePos = self.source.getMousePos()
+        return self.mousePos
+
+    def filterEvents(self, events):
+        events = self.source.filterEvents(events)
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONUP and event.button in replayButtons:
+                self.buttons.append(event.button)
+        return events
+
+    def nextFrame(self):
+        self.source.nextFrame()
+
+    def endFrame(self, checksum):
+        self.frames.append((self.keys, self.buttons, self.mousePos, checksum))
+        self.keys = 0
+        self.buttons = []
+
+    def save(self, path):
+        name = self.levelName.encode("utf-8")
+        body = [frameCount.pack(len(self.frames))]
+        for keys, buttons, mousePos, checksum in self.frames:
+            body.append(frameRecord.pack(keys, len(buttons), checksum))
+            if buttons:
+                body.append(bytes(buttons))
+                body.append(mouseRecord.pack(*mousePos))
+        with open(path, "wb") as outfile:
+            outfile.write(header.pack(magic, version, self.seed, len(name)))
+            outfile.write(name)
+            outfile.write(zlib.compress(b"".join(body), 9))
+
+
+class ReplayPlayer:
+    # input source that feeds a recorded session back one step at a time
+    def __init__(self, path):
+        with open(path, "rb") as infile:
+            data = infile.read()
+        fileMagic, fileVersion, self.seed, nameLength = header.unpack_from(data)
+        if fileMagic != magic or fileVersion != version:
+            raise ValueError("{} is not a version {} replay".format(path, version))
+        start = header.size + nameLength
+        self.levelName = data[header.size:start].decode("utf-8")
+        body = zlib.decompress(data[start:])
+        (count,) = frameCount.unpack_from(body)
+        offset = frameCount.size
+        self.frames = []
+        for _ in range(count):
+            keys, buttonCount, checksum = frameRecord.unpack_from(body, offset)
+            offset += frameRecord.size
+            buttons = list(body[offset:offset + buttonCount])
+            offset += buttonCount
+            mousePos = (0, 0)
+            if buttons:
+                mousePos = mouseRecord.unpack_from(body, offset)
+                offset += mouseRecord.size
+            self.frames.append((maskKeys(keys), buttons, mousePos, checksum))
+        self.frame = 0
+        self.released = PressedKeys(())
+        self.divergedAt = None
+
+    def getPressedKeys(self):
+        if self.frame < len(self.frames):
+            return self.frames[self.frame][0]
+        return self.released
+
+    def getMousePos(self):
+        if self.frame < len(self.frames):
+            return self.frames[self.frame][2]
+        return (0, 0)
+
+    def filterEvents(self, events):
+        # live keys and clicks are ignored, except the pause keys
+        events = [
+            event for event in events
+            if event.type == pygame.KEYDOWN and event.key in liveKeys
+        ]
+        if self.frame < len(self.frames):
+            _, buttons, mousePos, _ = self.frames[self.frame]
+            for button in buttons:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=mousePos))
+        return events
+
+    def nextFrame(self):
+        pass
+
+    def endFrame(self, checksum):
+        if self.frame < len(self.frames):
+            if checksum != self.frames[self.frame][3] and self.divergedAt is None:
+                self.divergedAt = self.frame
+        self.frame += 1
+
+    def finished(self):
+        return self.frame >= len(self.frames)
+
+    def report(self):
+        if self.divergedAt is None:
+            return "replay of {} frames matched".format(len(self.frames))
+        return "replay diverged at frame {} of {}".format(self.divergedAt, len(self.frames))
+
+
+if __name__ == "__main__":
+    # the class Simulation checks for, not this module's __main__ copy
+    from classes.Replay import ReplayPlayer
+    from classes.Simulation import Simulation
+
+    player = ReplayPlayer(sys.argv[1])
+    sim = Simulation(player.levelName, player, seed=player.seed)
+    start = time.perf_counter()
+    while not player.finished():
+        if not sim.step():
+            break
+    elapsed = time.perf_counter() - start
+    print("{} frames in {:.3f}s".format(sim.frame, elapsed))
+    print(player.report())
+    sys.exit(0 if player.divergedAt is None else 1)
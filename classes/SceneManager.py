@@ -0,0 +1,60 @@
+import pygame
+
+from classes.Profiler import profiler
+from classes.ProfilerOverlay import ProfilerOverlay
+from classes.StartupTrace import startupTrace
+
+
+class SceneManager:
+    # The game's one frame loop. Events are read once per frame: quitting
+    # and window resizes are handled here, everything else goes to the
+    # current scene. A scene's update(events) draws to the virtual screen
+    # and returns the scene for the next frame, itself to stay, or None to
+    # quit; the frame is then presented and paced here for every scene.
+    def __init__(self, presenter, maxFrameRate=60):
+        self.presenter = presenter
+        self.maxFrameRate = maxFrameRate
+        self.clock = pygame.time.Clock()
+        # F3 toggles the per-subsystem timings
+        self.overlay = ProfilerOverlay(presenter.virtualScreen)
+
+    def pumpEvents(self):
+        # the events for the scene, None when the window was closed
+        events = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+            if event.type == pygame.VIDEORESIZE:
+                self.presenter.resize((event.w, event.h))
+            else:
+                events.append(event)
+        return events
+
+    def run(self, scene):
+        firstFrame = True
+        while scene is not None:
+            profiler.beginFrame()
+            pygame.display.set_caption("Super Mario running with {:.0f} FPS".format(self.clock.get_fps()))
+            events = self.pumpEvents()
+            if events is None:
+                scene.quit()
+                break
+            self.overlay.checkInput(events)
+            nextScene = scene.update(events)
+            self.overlay.draw()
+
+            # Scale and blit to display
+            profiler.begin("present")
+            self.presenter.present()
+            profiler.end("present")
+            profiler.endFrame()
+            self.overlay.collect()
+            if firstFrame:
+                firstFrame = False
+                if scene.traceTitle is not None:
+                    startupTrace.finish(scene.traceTitle, scene.traceBudget)
+            if nextScene is not scene:
+                firstFrame = True
+            scene = nextScene
+            self.clock.tick(self.maxFrameRate)
+        pygame.quit()
@@ -0,0 +1,293 @@
+import random
+
+import pygame
+
+from classes.Assets import assets
+from classes.Dashboard import Dashboard
+from classes.DirtyRects import dirtyRects
+from classes.FixedStep import FixedStep
+from classes.GameOver import acquireSequence, sequenceKey
+from classes.Input import KeyboardInputSource
+from classes.Level import Level
+from classes.LevelLoader import LevelLoader
+from classes.Menu import Menu
+from classes.Profiler import profiler
+from classes.Replay import ReplayPlayer, ReplayRecorder, stateChecksum
+from classes.StartupTrace import startupTrace
+from entities.Mario import Mario
+
+# The scenes SceneManager runs. Each one draws to the virtual screen in
+# update(events) and returns the scene for the next frame.
+
+
+class Session:
+    # one run from the menu: the dashboard, the menu with the level it
+    # loads, the random seed and the replay being recorded or played.
+    # Going back to the menu starts a new session.
+    def __init__(self, screen, sound, options=None):
+        self.screen = screen
+        self.sound = sound
+        self.options = options
+        self.dashboard = Dashboard("./img/font.png", 8, screen)
+        startupTrace.mark("dashboard")
+        self.replay = None
+        if options is not None and options.replay:
+            self.replay = ReplayPlayer(options.replay)
+            self.seed = self.replay.seed
+        elif options is not None and options.seed is not None:
+            self.seed = options.seed
+        else:
+            self.seed = random.randrange(1 << 32)
+        # mobs pick their first direction at random while the level loads
+        random.seed(self.seed)
+        self.level = Level(screen, sound, self.dashboard)
+        startupTrace.mark("level")
+        self.menu = Menu(screen, self.dashboard, self.level, sound)
+        startupTrace.mark("menu")
+        acquireSequence(screen.get_size())
+        startupTrace.mark("game over")
+        if self.replay is not None:
+            self.menu.startLevel(self.replay.levelName)
+
+    def finishReplay(self):
+        replay = self.replay
+        if isinstance(replay, ReplayRecorder):
+            replay.save(self.options.record)
+            print("recorded {} frames to {}".format(len(replay.frames), self.options.record))
+            # going back to the menu starts an unrecorded session
+            self.options.record = None
+        elif isinstance(replay, ReplayPlayer):
+            print(replay.report())
+
+    def restart(self):
+        # the new session is made first so the assets both use stay loaded
+        session = Session(self.screen, self.sound, self.options)
+        self.release()
+        return MenuScene(session)
+
+    def release(self):
+        self.menu.release()
+        self.level.release()
+        self.dashboard.release()
+        assets.release(sequenceKey(self.screen.get_size()))
+
+
+class MenuScene:
+    traceTitle = "time to menu"
+
+    def __init__(self, session):
+        self.session = session
+        self.traceBudget = startupTrace.menuBudget
+
+    def update(self, events):
+        menu = self.session.menu
+        menu.update(events)
+        if menu.start:
+            return PlayScene(self.session, self.session.level)
+        return self
+
+    def quit(self):
+        pass
+
+
+class PlayScene:
+    traceTitle = "time to first game frame"
+    traceBudget = None
+
+    def __init__(self, session, level):
+        startupTrace.begin()
+        self.session = session
+        self.level = level
+        options = session.options
+        if options is not None and options.record:
+            session.replay = ReplayRecorder(KeyboardInputSource(), level.name, session.seed)
+        self.mario = Mario(
+            0, 0, level, session.screen, session.dashboard, session.sound,
+            inputSource=session.replay
+        )
+        startupTrace.mark("mario")
+        if options is not None and options.asset_report:
+            print(assets.report())
+            print(level.tileMap.report())
+        self.fixedStep = FixedStep(60)
+        self.pendingEvents = []
+        # the next level loads a slice per frame while this one is played
+        self.nextLoader = None
+        nextLevelName = session.menu.nextLevelName(level.name)
+        if nextLevelName is not None and not isinstance(session.replay, ReplayPlayer):
+            self.nextLoader = LevelLoader(Level(session.screen, session.sound, session.dashboard), nextLevelName)
+        startupTrace.mark("next level")
+
+    def update(self, events):
+        level, mario, dashboard = self.level, self.mario, self.session.dashboard
+        replay = self.session.replay
+        # the game advances in fixed steps whatever the frame rate;
+        # input arriving between steps is handed to the next one
+        self.pendingEvents.extend(events)
+        for _ in range(self.fixedStep.advance()):
+            profiler.begin("drawLevel")
+            level.update(mario.camera)
+            profiler.end("drawLevel")
+            profiler.begin("dashboard")
+            dashboard.update()
+            profiler.end("dashboard")
+            mario.update(self.pendingEvents)
+            self.pendingEvents = []
+            if replay is not None:
+                replay.endFrame(stateChecksum(level, mario, dashboard))
+            if mario.pause or mario.restart or mario.dying:
+                break
+        if mario.pause:
+            return PauseScene(self)
+        if mario.dying:
+            return GameOverScene(self)
+        if mario.restart:
+            return self.end()
+        alpha = self.fixedStep.alpha
+        level.drawLevel(mario.camera, alpha)
+        profiler.begin("dashboard")
+        dashboard.draw()
+        profiler.end("dashboard")
+        mario.draw(alpha)
+        if self.nextLoader is not None and not self.nextLoader.done:
+            profiler.begin("preload")
+            self.nextLoader.update()
+            profiler.end("preload")
+        if isinstance(replay, ReplayPlayer) and replay.finished():
+            self.session.finishReplay()
+            return None
+        return self
+
+    def resume(self):
+        # back from a scene that stopped the game
+        self.fixedStep.reset()
+        return self
+
+    def end(self):
+        self.session.finishReplay()
+        if isinstance(self.session.replay, ReplayPlayer):
+            return None
+        if self.mario.won:
+            return WinScene(self)
+        return self.restart()
+
+    def restart(self):
+        scene = self.session.restart()
+        self.release()
+        return scene
+
+    def nextLevel(self):
+        if self.nextLoader is None:
+            return self.restart()
+        # reaching Meloni goes straight on to the preloaded level
+        session = self.session
+        level = self.nextLoader.finish()
+        self.nextLoader = None
+        session.dashboard.startLevel(level.name)
+        if session.menu.music:
+            session.sound.music_channel.play(session.sound.soundtrack, loops=-1)
+        session.replay = None
+        session.level = level
+        scene = PlayScene(session, level)
+        self.release()
+        self.level.release()
+        return scene
+
+    def release(self):
+        # the level belongs to the session, the preloaded one until it is played
+        self.mario.release()
+        if self.nextLoader is not None:
+            self.nextLoader.level.release()
+            self.nextLoader = None
+
+    def quit(self):
+        self.session.finishReplay()
+
+
+class PauseScene:
+    traceTitle = None
+
+    def __init__(self, play):
+        self.play = play
+
+    def update(self, events):
+        mario = self.play.mario
+        mario.pauseObj.update(events)
+        if mario.restart:
+            return self.play.end()
+        if not mario.pause:
+            return self.play.resume()
+        return self
+
+    def quit(self):
+        self.play.quit()
+
+
+class GameOverScene:
+    traceTitle = None
+
+    def __init__(self, play):
+        self.play = play
+
+    def update(self, events):
+        # runs until the death sound has ended
+        if self.play.mario.gameOverScreen.update():
+            return self
+        return self.play.end()
+
+    def quit(self):
+        self.play.quit()
+
+
+class WinScene:
+    # "You Won!" for three seconds or until a key is pressed, then the win
+    # video, which a key also skips, then the next level
+    traceTitle = None
+    textTime = 3000
+
+    def __init__(self, play):
+        self.play = play
+        self.screen = play.session.screen
+        self.sound = play.session.sound
+        self.text = pygame.font.Font(None, 74).render("You Won!", True, (255, 255, 255))
+        self.startTime = pygame.time.get_ticks()
+        self.player = None
+        dirtyRects.invalidate()
+        self.screen.fill((0, 0, 0))
+        self.screen.blit(self.text, self.text.get_rect(center=self.screen.get_rect().center))
+
+    def update(self, events):
+        keyPressed = any(event.type == pygame.KEYDOWN for event in events)
+        if self.player is None:
+            if keyPressed or pygame.time.get_ticks() - self.startTime > self.textTime:
+                return self.startVideo()
+            return self
+        if keyPressed:
+            self.player.stop()
+        if not self.player.update():
+            return self.end()
+        dirtyRects.invalidate()
+        self.player.draw(self.screen)
+        return self
+
+    def startVideo(self):
+        # OpenCV is only imported when a video is played
+        from classes.VideoPlayer import VideoPlayer
+
+        self.player = VideoPlayer("./img/win_video.mp4", self.screen.get_size())
+        if not self.player.opened:
+            print("Error opening video file")
+            return self.play.nextLevel()
+        # Play end music on loop
+        self.sound.music_channel.play(self.sound.end_music, loops=-1)
+        return self
+
+    def end(self):
+        self.player.stop()
+        self.sound.music_channel.stop()
+        return self.play.nextLevel()
+
+    def quit(self):
+        if self.player is not None:
+            self.player.stop()
+        self.play.quit()
@@ -0,0 +1,118 @@
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from classes.Dashboard import Dashboard
+from classes.Input import ScriptedInputSource
+from classes.Level import Level
+from classes.Presenter import Presenter
+from classes.Profiler import profiler
+from classes.Replay import ReplayPlayer, ReplayRecorder, stateChecksum
+from classes.Sound import Sound
+
+windowSize = 640, 480
+
+
+def initHeadless():
+    # dummy SDL drivers: no window and no audio device are opened
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+
+class Simulation:
+    def __init__(self, levelName, inputSource=None, seed=0, present=False, displaySize=windowSize,
+                 scaling="nearest"):
+        initHeadless()
+        # Mario builds its sprite collection at import time
+        from entities.Mario import Mario
+
+        random.seed(seed)
+        self.seed = seed
+        self.levelName = levelName
+        self.screen = pygame.Surface(windowSize)
+        # with present set, frames are also scaled onto a (dummy) display
+        self.display = pygame.display.set_mode(displaySize) if present else None
+        self.presenter = Presenter(self.screen, self.display, scaling) if present else None
+        self.input = inputSource if inputSource is not None else ScriptedInputSource([])
+        # replay sources check or record the state after every step
+        self.replay = self.input if isinstance(self.input, (ReplayPlayer, ReplayRecorder)) else None
+        self.sound = Sound(headless=True)
+        self.dashboard = Dashboard("./img/font.png", 8, self.screen)
+        self.dashboard.state = "start"
+        self.dashboard.levelName = levelName.split("Level")[-1]
+        self.level = Level(self.screen, self.sound, self.dashboard)
+        self.level.loadLevel(levelName)
+        self.mario = Mario(
+            0, 0, self.level, self.screen, self.dashboard, self.sound,
+            headless=True, inputSource=self.input
+        )
+        self.frame = 0
+
+    def release(self):
+        self.mario.release()
+        self.level.release()
+        self.dashboard.release()
+        self.sound.release()
+
+    def step(self, events=None):
+        if events is None:
+            events = []
+        profiler.beginFrame()
+        profiler.begin("drawLevel")
+        self.level.update(self.mario.camera)
+        profiler.end("drawLevel")
+        profiler.begin("dashboard")
+        self.dashboard.update()
+        profiler.end("dashboard")
+        profiler.begin("mario")
+        self.mario.update(events)
+        profiler.end("mario")
+        self.render()
+        profiler.endFrame()
+        if self.replay is not None:
+            self.replay.endFrame(stateChecksum(self.level, self.mario, self.dashboard))
+        self.input.nextFrame()
+        self.frame += 1
+        return not self.mario.restart
+
+    def render(self, alpha=1.0):
+        profiler.begin("drawLevel")
+        self.level.drawLevel(self.mario.camera, alpha)
+        profiler.end("drawLevel")
+        profiler.begin("dashboard")
+        self.dashboard.draw()
+        profiler.end("dashboard")
+        profiler.begin("mario")
+        self.mario.draw(alpha)
+        profiler.end("mario")
+        if self.display is not None:
+            profiler.begin("present")
+            self.present()
+            profiler.end("present")
+
+    def present(self):
+        self.presenter.present()
+
+    def run(self, frames):
+        for _ in range(frames):
+            if not self.step():
+                break
+        return self.frame
+
+
+if __name__ == "__main__":
+    # python -m classes.Simulation [levelName] [frames]
+    levelName = sys.argv[1] if len(sys.argv) > 1 else "Level1-1"
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+    script = ScriptedInputSource(
+        [(90, [pygame.K_RIGHT]), (20, [pygame.K_RIGHT, pygame.K_SPACE])], loop=True
+    )
+    sim = Simulation(levelName, script)
+    start = time.perf_counter()
+    played = sim.run(frames)
+    elapsed = time.perf_counter() - start
+    print("{} frames in {:.3f}s ({:.0f} frames/s)".format(played, elapsed, played / elapsed))
@@ -1,30 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+
 from pygame import mixer
 
+from classes.Assets import assets, assetBytes
+
+soundFiles = {
+    "soundtrack": "./sfx/main.mp3",
+    "coin": "./sfx/coins.mp3", # Override default coin sound
+    "bump": "./sfx/bump.ogg",
+    "stomp": "./sfx/stomp.ogg",
+    "jump": "./sfx/small_jump.ogg",
+    "death": "./sfx/death.mp3",
+    "kick": "./sfx/kick.ogg",
+    "brick_bump": "./sfx/brick-bump.ogg",
+    "powerup": "./sfx/powerup.ogg",
+    "powerup_appear": "./sfx/powerup_appears.ogg",
+    "pipe": "./sfx/pipe.ogg",
+    # Custom sounds
+    "ah": "./sfx/ah.mp3",
+    "end_music": "./sfx/end.mp3",
+}
+# decoded ahead of use by the preload thread; the music tracks are left
+# to load when first played
+effects = [
+    "jump", "coin", "bump", "stomp", "kick", "brick_bump", "powerup",
+    "powerup_appear", "pipe", "ah",
+]
+
+
+class SilentChannel:
+    def play(self, sound, loops=0):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+    def get_busy(self):
+        return False
+
 
 class Sound:
-    def __init__(self):
-        self.music_channel = mixer.Channel(0)
+    # sound.coin, sound.jump, ... are decoded on first use, or earlier by
+    # a background thread, through assets and the PCM cache. At most
+    # maxBytes of decoded samples are held; the least recently used sound
+    # is dropped beyond that and decoded again when next needed.
+    def __init__(self, headless=False, maxBytes=48 * 1024 * 1024, preload=True):
+        self.headless = headless
+        if headless:
+            self.music_channel = SilentChannel()
+            self.sfx_channel = SilentChannel()
+        else:
+            self.music_channel = mixer.Channel(0)
+            self.sfx_channel = mixer.Channel(1)
         self.music_channel.set_volume(0.2)
-        self.sfx_channel = mixer.Channel(1)
         self.sfx_channel.set_volume(0.2)
 
         self.allowSFX = True
 
-        self.soundtrack = mixer.Sound("./sfx/main.mp3")
-        self.coin = mixer.Sound("./sfx/coins.mp3") # Override default coin sound
-        self.bump = mixer.Sound("./sfx/bump.ogg")
-        self.stomp = mixer.Sound("./sfx/stomp.ogg")
-        self.jump = mixer.Sound("./sfx/small_jump.ogg")
-        self.death = mixer.Sound("./sfx/death.mp3")
-        self.kick = mixer.Sound("./sfx/kick.ogg")
-        self.brick_bump = mixer.Sound("./sfx/brick-bump.ogg")
-        self.powerup = mixer.Sound('./sfx/powerup.ogg')
-        self.powerup_appear = mixer.Sound('./sfx/powerup_appears.ogg')
-        self.pipe = mixer.Sound('./sfx/pipe.ogg')
-        
-        # Custom sounds
-        self.ah = mixer.Sound("./sfx/ah.mp3")
-        self.end_music = mixer.Sound("./sfx/end.mp3")
+        self.maxBytes = maxBytes
+        self.loaded = OrderedDict()
+        self.loadedBytes = 0
+        self.lock = threading.Lock()
+        self.preloadThread = None
+        if not headless and preload:
+            self.preloadThread = threading.Thread(target=self.preload, daemon=True)
+            self.preloadThread.start()
+
+    def __getattr__(self, name):
+        if name not in soundFiles:
+            raise AttributeError(name)
+        if self.headless:
+            # no mixer: every effect is a silent placeholder
+            return None
+        return self.get(name)
+
+    def get(self, name):
+        with self.lock:
+            sound = self.loaded.get(name)
+            if sound is not None:
+                self.loaded.move_to_end(name)
+                return sound
+        # decoded without the lock, so the game never waits for an effect
+        # the preload thread is still decoding
+        sound = assets.sound(soundFiles[name])
+        with self.lock:
+            loaded = self.loaded.get(name)
+            if loaded is not None:
+                # the other thread got there first; keep one reference
+                assets.release(("sound", os.path.normpath(soundFiles[name])))
+                self.loaded.move_to_end(name)
+                return loaded
+            self.loaded[name] = sound
+            self.loadedBytes += assetBytes(sound)
+            while self.loadedBytes > self.maxBytes and len(self.loaded) > 1:
+                self.drop(next(iter(self.loaded)))
+            return sound
+
+    def drop(self, name):
+        # a sound still playing is kept alive by its channel
+        sound = self.loaded.pop(name)
+        self.loadedBytes -= assetBytes(sound)
+        assets.release(("sound", os.path.normpath(soundFiles[name])))
+
+    def release(self):
+        if self.preloadThread is not None:
+            self.preloadThread.join()
+        with self.lock:
+            for name in list(self.loaded):
+                self.drop(name)
+
+    def preload(self):
+        for name in effects:
+            self.get(name)
 
     def play_sfx(self, sfx):
         if self.allowSFX:
@@ -0,0 +1,73 @@
+import os
+import struct
+import sys
+
+import pygame
+
+from classes import CacheFile
+
+# Decoded samples of each sound file, so later launches skip decoding the
+# MP3s. One file per sound, valid for the source it was decoded from and
+# the mixer format it was decoded to.
+#
+#   magic, version, source size and mtime, frequency, sample size,
+#   channels, raw samples
+#
+# Build it ahead of time with: python -m classes.SoundCache
+
+cacheDir = "./cache/sounds"
+magic = b"MPCM"
+version = 1
+header = struct.Struct("<4sHQqihh")
+
+
+def cachePath(path):
+    return os.path.join(cacheDir, os.path.basename(path) + ".pcm")
+
+
+def sourceStamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save(path, sound, stamp, init):
+    CacheFile.write(cachePath(path), [
+        header.pack(magic, version, stamp[0], stamp[1], *init),
+        sound.get_raw(),
+    ])
+
+
+def load(path, stamp, init):
+    data = CacheFile.read(cachePath(path))
+    fields = CacheFile.unpackHeader(data, header, magic, version)
+    if fields is None:
+        return None
+    size, mtime, frequency, sampleSize, channels = fields
+    if (size, mtime) != stamp:
+        return None
+    if (frequency, sampleSize, channels) != init:
+        return None
+    return pygame.mixer.Sound(buffer=data[header.size:])
+
+
+def sound(path):
+    # the sound from the cache, decoding and caching it when needed
+    init = pygame.mixer.get_init()
+    stamp = sourceStamp(path)
+    cached = load(path, stamp, init)
+    if cached is not None:
+        return cached
+    decoded = pygame.mixer.Sound(path)
+    save(path, decoded, stamp, init)
+    return decoded
+
+
+if __name__ == "__main__":
+    pygame.mixer.pre_init(44100, -16, 2, 4096)
+    pygame.mixer.init()
+    paths = sys.argv[1:] or sorted(
+        os.path.join("./sfx", name) for name in os.listdir("./sfx") if name.endswith((".mp3", ".ogg"))
+    )
+    for path in paths:
+        sound(path)
+        print("cached {}".format(path))
@@ -0,0 +1,52 @@
+class SpatialHash:
+    # entities bucketed by the tile columns their rect covers
+    def __init__(self, cellSize=32):
+        self.cellSize = cellSize
+        self.cells = {}
+        # entity -> (insertion order, first column, last column)
+        self.entries = {}
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def rebuild(self, entities):
+        self.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def insert(self, entity):
+        if entity in self.entries:
+            return
+        first = entity.rect.left // self.cellSize
+        last = (entity.rect.right - 1) // self.cellSize
+        self.entries[entity] = (len(self.entries), first, last)
+        for column in range(first, last + 1):
+            bucket = self.cells.get(column)
+            if bucket is None:
+                self.cells[column] = [entity]
+            else:
+                bucket.append(entity)
+
+    def remove(self, entity):
+        entry = self.entries.pop(entity, None)
+        if entry is None:
+            return
+        for column in range(entry[1], entry[2] + 1):
+            self.cells[column].remove(entity)
+
+    def query(self, rect, margin=1):
+        # neighbours of rect, in insertion order; margin columns on each
+        # side cover entities that moved since the last rebuild
+        return self.queryColumns(
+            rect.left // self.cellSize - margin, (rect.right - 1) // self.cellSize + margin
+        )
+
+    def queryColumns(self, first, last):
+        found = {}
+        for column in range(first, last + 1):
+            bucket = self.cells.get(column)
+            if bucket:
+                for entity in bucket:
+                    found[entity] = self.entries[entity][0]
+        return sorted(found, key=found.__getitem__)
@@ -1,32 +1,46 @@
 import json
 import pygame
 
+from classes import AssetCache
 from classes.Animation import Animation
 from classes.Sprite import Sprite
 from classes.Spritesheet import Spritesheet
 
 
+manifests = [
+    "./sprites/Mario.json",
+    "./sprites/Goomba.json",
+    "./sprites/Koopa.json",
+    "./sprites/Animations.json",
+    "./sprites/BackgroundSprites.json",
+    "./sprites/ItemAnimations.json",
+    "./sprites/RedMushroom.json"
+]
+
+customImages = [
+    "./img/character.png",
+    "./img/enemy.png",
+    "./img/happy_character.png",
+    "./img/meloni.png",
+]
+
+
 class Sprites:
-    def __init__(self):
-        self.spriteCollection = self.loadSprites(
-            [
-                "./sprites/Mario.json",
-                "./sprites/Goomba.json",
-                "./sprites/Koopa.json",
-                "./sprites/Animations.json",
-                "./sprites/BackgroundSprites.json",
-                "./sprites/ItemAnimations.json",
-                "./sprites/RedMushroom.json"
-            ]
-        )
-        self.loadCustomSprites()
+    def __init__(self, useCache=True):
+        self.digest = AssetCache.sourceDigest(manifests, customImages)
+        self.spriteCollection = AssetCache.load(self.digest) if useCache else None
+        if self.spriteCollection is None:
+            self.spriteCollection = self.loadSprites(manifests)
+            self.loadCustomSprites()
+            if useCache:
+                # sources changed or no cache yet
+                AssetCache.save(self.spriteCollection, self.digest)
 
     def loadCustomSprites(self):
         # Load custom images
-        character_img = pygame.image.load("./img/character.png")
-        enemy_img = pygame.image.load("./img/enemy.png")
-        happy_img = pygame.image.load("./img/happy_character.png")
-        meloni_img = pygame.image.load("./img/meloni.png")
+        character_img, enemy_img, happy_img, meloni_img = [
+            pygame.image.load(path) for path in customImages
+        ]
 
         # Scale images to standard sprite sizes (32x32 for small, 32x64 for big if needed, but let's stick to 32x32 for simplicity or match existing)
         # Mario small is 32x32
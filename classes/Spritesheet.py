@@ -1,16 +1,18 @@
+import os
+
 import pygame
 
+from classes.Assets import assets
+
 
 class Spritesheet(object):
     def __init__(self, filename):
-        try:
-            self.sheet = pygame.image.load(filename)
-            self.sheet = pygame.image.load(filename)
-            if not self.sheet.get_alpha():
-                self.sheet.set_colorkey((0, 0, 0))
-        except pygame.error:
-            print("Unable to load spritesheet image:", filename)
-            raise SystemExit
+        # decoded once per process and shared
+        self.sheet = assets.sheet(filename)
+        self.sheetKey = ("sheet", os.path.normpath(filename))
+
+    def release(self):
+        assets.release(self.sheetKey)
 
     def image_at(self, x, y, scalingfactor, colorkey=None, ignoreTileSize=False,
                  xTileSize=16, yTileSize=16):
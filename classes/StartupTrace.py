@@ -0,0 +1,55 @@
+import sys
+import time
+
+# modules that are slow to import and only needed for rarely used
+# features; the report lists the ones already loaded
+lazyModules = ("cv2",)
+
+
+class StartupTrace:
+    # Wall time of each startup phase up to a first frame, e.g. imports,
+    # the display, assets, the first menu frame. Phases are always timed,
+    # which costs next to nothing; they are printed when enabled.
+    def __init__(self):
+        self.enabled = False
+        # milliseconds allowed to the first menu frame, None for no target
+        self.menuBudget = None
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+        self.reported = set()
+
+    def begin(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def finish(self, title, budget=None):
+        # marks the first frame and prints the phases, once per title
+        self.mark("first frame")
+        if self.enabled and title not in self.reported:
+            self.reported.add(title)
+            print(self.report(title, budget))
+        self.begin()
+
+    def report(self, title, budget=None):
+        total = (self.last - self.start) * 1000
+        lines = ["{} {:.1f} ms".format(title, total)]
+        for name, elapsed in self.phases:
+            lines.append("  {:<16} {:>8.1f} ms".format(name, elapsed * 1000))
+        loaded = [name for name in lazyModules if name in sys.modules]
+        lines.append("  heavy modules loaded: {}".format(", ".join(loaded) or "none"))
+        if budget is not None:
+            if total <= budget:
+                lines.append("  within the {:.0f} ms budget".format(budget))
+            else:
+                lines.append("  over the {:.0f} ms budget by {:.1f} ms".format(budget, total - budget))
+        return "\n".join(lines)
+
+
+startupTrace = StartupTrace()
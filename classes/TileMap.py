@@ -0,0 +1,99 @@
+import sys
+
+import numpy as np
+import pygame
+
+
+class TileType:
+    def __init__(self, sprite, solid, offsetY):
+        self.sprite = sprite
+        self.solid = solid
+        # collision rect offset from the cell; boxes sit one pixel higher
+        self.offsetY = offsetY
+
+
+class TileMap:
+    # one byte per cell indexing a palette of tile types, instead of a Tile
+    # object with its own Rect per cell; rects are built when asked for.
+    # The map can be a window of width columns starting at world column
+    # originX; the accessors take world columns.
+    def __init__(self, width, height, tileSize=32, originX=0):
+        self.width = width
+        self.height = height
+        self.tileSize = tileSize
+        self.originX = originX
+        self.ids = bytearray(width * height)
+        # 1 where the cell's tile is solid, so colliders can find() them
+        self.solid = bytearray(width * height)
+        # writable NumPy views of ids and solid, row major
+        self.grid = np.frombuffer(self.ids, dtype=np.uint8).reshape(height, width)
+        self.solidGrid = np.frombuffer(self.solid, dtype=np.uint8).reshape(height, width)
+        self.palette = []
+        self.paletteIds = {}
+        # id 0 is an empty cell
+        self.tileId(None)
+
+    def tileId(self, sprite, solid=False, offsetY=0):
+        key = (sprite, solid, offsetY)
+        tileId = self.paletteIds.get(key)
+        if tileId is None:
+            if len(self.palette) == 256:
+                raise ValueError("more than 256 tile types in one map")
+            tileId = len(self.palette)
+            self.palette.append(TileType(sprite, solid, offsetY))
+            self.paletteIds[key] = tileId
+        return tileId
+
+    def inBounds(self, x, y):
+        return 0 <= x - self.originX < self.width and 0 <= y < self.height
+
+    def index(self, x, y):
+        return y * self.width + x - self.originX
+
+    def set(self, x, y, sprite, solid=False, offsetY=0):
+        if not self.inBounds(x, y):
+            raise IndexError("tile {},{} outside the {}x{} map".format(x, y, self.width, self.height))
+        self.ids[self.index(x, y)] = self.tileId(sprite, solid, offsetY)
+        self.solid[self.index(x, y)] = 1 if solid else 0
+
+    def get(self, x, y):
+        return self.palette[self.ids[self.index(x, y)]]
+
+    def spriteAt(self, x, y):
+        return self.palette[self.ids[self.index(x, y)]].sprite
+
+    def isSolid(self, x, y):
+        return self.solid[self.index(x, y)] == 1
+
+    def rectAt(self, x, y):
+        tileType = self.palette[self.ids[self.index(x, y)]]
+        if not tileType.solid:
+            return None
+        size = self.tileSize
+        return pygame.Rect(x * size, y * size + tileType.offsetY, size, size)
+
+    def scroll(self, originX):
+        # move the window; columns still inside keep their tiles, the
+        # ones that came into view are left empty
+        shift = originX - self.originX
+        self.originX = originX
+        for grid in (self.grid, self.solidGrid):
+            if abs(shift) >= self.width:
+                grid[:] = 0
+            elif shift > 0:
+                grid[:, :-shift] = grid[:, shift:]
+                grid[:, -shift:] = 0
+            elif shift < 0:
+                grid[:, -shift:] = grid[:, :shift]
+                grid[:, :-shift] = 0
+
+    def memoryUsage(self):
+        # id grid plus palette entries; sprites are shared assets
+        return len(self.ids) + len(self.solid) + sum(
+            sys.getsizeof(tileType) + sys.getsizeof(tileType.__dict__) for tileType in self.palette
+        )
+
+    def report(self):
+        return "tile map {}x{} from column {}, {} tile types, {:.1f} KB".format(
+            self.width, self.height, self.originX, len(self.palette), self.memoryUsage() / 1024.0
+        )
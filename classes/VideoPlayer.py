@@ -0,0 +1,92 @@
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+
+class VideoPlayer:
+    # Plays a video file scaled to fit size, e.g. for cutscenes. A thread
+    # decodes, scales and converts the frames into a bounded queue; the
+    # game thread copies the frame that is due into one reused surface.
+    # Frames that are late by then are dropped, and if the decoder falls
+    # behind the last frame stays up, so the caller never waits on it.
+    def __init__(self, path, size, queueSize=8):
+        self.capture = cv2.VideoCapture(path)
+        self.opened = self.capture.isOpened()
+        self.frameRate = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)) or size[0]
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) or size[1]
+        scale = min(size[0] / float(width), size[1] / float(height))
+        self.frameSize = (max(1, int(width * scale)), max(1, int(height * scale)))
+        # centred on the target
+        self.pos = ((size[0] - self.frameSize[0]) // 2, (size[1] - self.frameSize[1]) // 2)
+        self.surface = pygame.Surface(self.frameSize)
+        self.frames = queue.Queue(queueSize)
+        self.stopped = threading.Event()
+        self.finished = not self.opened
+        self.shown = -1
+        self.dropped = 0
+        self.startTime = None
+        self.thread = None
+        if self.opened:
+            self.thread = threading.Thread(target=self.decode, daemon=True)
+            self.thread.start()
+
+    def decode(self):
+        index = 0
+        while not self.stopped.is_set():
+            ok, frame = self.capture.read()
+            if not ok:
+                break
+            frame = cv2.resize(frame, self.frameSize, interpolation=cv2.INTER_AREA)
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # surfarray wants columns first
+            self.put((index, np.ascontiguousarray(frame.swapaxes(0, 1))))
+            index += 1
+        self.capture.release()
+        # end of the video
+        self.put(None)
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.frames.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+
+    def update(self):
+        # shows the frame due now; False once the video has ended
+        if self.finished:
+            return False
+        now = time.perf_counter()
+        if self.startTime is None:
+            self.startTime = now
+        due = int((now - self.startTime) * self.frameRate)
+        frame = None
+        while self.shown < due:
+            try:
+                item = self.frames.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.finished = True
+                break
+            if frame is not None:
+                self.dropped += 1
+            self.shown, frame = item
+        if frame is not None:
+            pygame.surfarray.blit_array(self.surface, frame)
+        return not self.finished
+
+    def draw(self, screen):
+        screen.fill((0, 0, 0))
+        if self.shown >= 0:
+            screen.blit(self.surface, self.pos)
+
+    def stop(self):
+        self.stopped.set()
+        self.finished = True
@@ -12,6 +12,7 @@ setup(
         ("sfx", glob.glob("sfx\\*.ogg") + glob.glob("sfx\\*.wav")),
         ("levels", glob.glob("levels\\*.json")),
         ("img", glob.glob("img\\*.gif") + glob.glob("img\\*.png")),
+        ("cache", glob.glob("cache\\*.bin")),
         ("", ["settings.json"]),
     ],
 )
@@ -14,4 +14,7 @@ class Coin(EntityBase):
     def update(self, cam):
         if self.alive:
             self.animation.update()
-            self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y))
+
+    def draw(self, cam, alpha):
+        if self.alive:
+            self.screen.blit(self.animation.image, self.drawPos(cam, alpha))
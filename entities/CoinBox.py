@@ -19,12 +19,21 @@ class CoinBox(EntityBase):
         self.vel = 1
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
+    def release(self):
+        self.item.release()
+
+    def markUsed(self):
+        self.triggered = True
+        self.time = self.maxTime * 2
+        self.animation.image = self.spriteCollection.get("empty").image
+        self.item.finish()
+
     def update(self, cam):
         if self.alive and not self.triggered:
             self.animation.update()
         else:
             self.animation.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
+            self.item.spawnCoin(self.sound, self.dashboard)
             if self.time < self.maxTime:
                 self.time += 1
                 self.rect.y -= self.vel
@@ -32,8 +41,10 @@ class CoinBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
-        self.screen.blit(
-            self.spriteCollection.get("sky").image,
-            (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1))
+
+    def draw(self, cam, alpha):
+        if not self.alive or self.triggered:
+            self.item.draw(cam, alpha)
+        x, y = self.drawPos(cam, alpha)
+        self.screen.blit(self.spriteCollection.get("sky").image, (x, y + 2))
+        self.screen.blit(self.animation.image, (x, y - 1))
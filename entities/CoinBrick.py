@@ -16,12 +16,22 @@ class CoinBrick(EntityBase):
         self.dashboard = dashboard
         self.item = Item(spriteCollection, screen, self.rect.x, self.rect.y)
 
+    def release(self):
+        self.item.release()
+
+    def markUsed(self):
+        self.triggered = True
+        self.image = self.spriteCollection.get("empty").image
+        self.item.finish()
+
     def update(self, cam):
         if not self.alive or self.triggered:
             self.image = self.spriteCollection.get("empty").image
-            self.item.spawnCoin(cam, self.sound, self.dashboard)
-        self.screen.blit(
-            self.spriteCollection.get("sky").image,
-            (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.image, (self.rect.x + cam.x, self.rect.y - 1))
+            self.item.spawnCoin(self.sound, self.dashboard)
+
+    def draw(self, cam, alpha):
+        if not self.alive or self.triggered:
+            self.item.draw(cam, alpha)
+        x, y = self.drawPos(cam, alpha)
+        self.screen.blit(self.spriteCollection.get("sky").image, (x, y + 2))
+        self.screen.blit(self.image, (x, y - 1))
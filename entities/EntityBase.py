@@ -7,6 +7,9 @@ class EntityBase(object):
     def __init__(self, x, y, gravity):
         self.vel = Vec2D()
         self.rect = pygame.Rect(x * 32, y * 32, 32, 32)
+        # position at the start of the last simulation step
+        self.prevX = self.rect.x
+        self.prevY = self.rect.y
         self.gravity = gravity
         self.traits = None
         self.alive = True
@@ -29,8 +32,30 @@ class EntityBase(object):
             except AttributeError:
                 pass
 
+    def release(self):
+        # entities holding shared assets give them back here when they
+        # leave the level for good
+        pass
+
     def getPosIndex(self):
         return Vec2D(self.rect.x // 32, self.rect.y // 32)
 
+    def beginStep(self):
+        self.prevX = self.rect.x
+        self.prevY = self.rect.y
+
+    def drawPos(self, camera, alpha):
+        # screen position between the previous and the current step
+        return (
+            self.rect.x - (self.rect.x - self.prevX) * (1 - alpha) + camera.drawX(alpha),
+            self.rect.y - (self.rect.y - self.prevY) * (1 - alpha),
+        )
+
+    def drawArea(self, camera, alpha):
+        # screen region the entity may draw to: koopas are drawn 32px
+        # above their rect and blocks bump a few pixels up and down
+        x, y = self.drawPos(camera, alpha)
+        return pygame.Rect(x - 1, y - 32, self.rect.width + 2, self.rect.height + 36)
+
     def getPosIndexAsFloat(self):
         return Vec2D(self.rect.x / 32.0, self.rect.y / 32.0)
@@ -1,5 +1,4 @@
 from classes.Animation import Animation
-from classes.Collider import Collider
 from classes.EntityCollider import EntityCollider
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
@@ -20,7 +19,6 @@ class Goomba(EntityBase):
         self.leftrightTrait = LeftRightWalkTrait(self, level)
         self.type = "Mob"
         self.dashboard = level.dashboard
-        self.collision = Collider(self, level)
         self.EntityCollider = EntityCollider(self)
         self.levelObj = level
         self.sound = sound
@@ -28,42 +26,40 @@ class Goomba(EntityBase):
 
     def update(self, camera):
         if self.alive:
-            self.applyGravity()
-            self.drawGoomba(camera)
+            self.animation.update()
             self.leftrightTrait.update()
-            self.checkEntityCollision()
+            self.levelObj.mobEngine.queueCollision(self)
         else:
-            self.onDead(camera)
+            self.onDead()
 
-    def drawGoomba(self, camera):
-        self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y))
-        self.animation.update()
+    def draw(self, camera, alpha):
+        if self.alive:
+            self.screen.blit(self.animation.image, self.drawPos(camera, alpha))
+        else:
+            self.drawPointsText(camera, alpha)
+            self.screen.blit(
+                self.spriteCollection.get("goomba-flat").image, self.drawPos(camera, alpha)
+            )
+
+    def kill(self):
+        self.alive = False
+        self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
 
-    def onDead(self, camera):
-        if self.timer == 0:
-            self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
+    def onDead(self):
         if self.timer < self.timeAfterDeath:
-            self.movePointsTextUpAndDraw(camera)
-            self.drawFlatGoomba(camera)
+            self.textPos.y += -0.5
         else:
             self.alive = None
         self.timer += 0.1
 
-    def drawFlatGoomba(self, camera):
-        self.screen.blit(
-            self.spriteCollection.get("goomba-flat").image,
-            (self.rect.x + camera.x, self.rect.y),
-        )
-
     def setPointsTextStartPosition(self, x, y):
         self.textPos = Vec2D(x, y)
 
-    def movePointsTextUpAndDraw(self, camera):
-        self.textPos.y += -0.5
-        self.dashboard.drawText("100", self.textPos.x + camera.x, self.textPos.y, 8)
+    def drawPointsText(self, camera, alpha):
+        self.dashboard.drawText("100", self.textPos.x + camera.drawX(alpha), self.textPos.y, 8)
     
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.shellGrid.query(self.rect):
             collisionState = self.EntityCollider.check(ent)
             if collisionState.isColliding:
                 if ent.type == "Mob":
@@ -71,5 +67,5 @@ class Goomba(EntityBase):
 
     def _onCollisionWithMob(self, mob, collisionState):
         if collisionState.isColliding and mob.bouncing:
-            self.alive = False
+            self.kill()
             self.sound.play_sfx(self.sound.brick_bump)
@@ -1,6 +1,7 @@
 from copy import copy
 
 from classes.Dashboard import Dashboard
+from classes.DirtyRects import dirtyRects
 from classes.Maths import Vec2D
 
 
@@ -13,7 +14,7 @@ class Item(Dashboard):
         self.coin_animation = copy(collection.get("coin-item").animation)
         self.sound_played = False
 
-    def spawnCoin(self, cam, sound, dashboard):
+    def spawnCoin(self, sound, dashboard):
         if not self.sound_played:
             self.sound_played = True
             dashboard.points += 100
@@ -26,10 +27,18 @@ class Item(Dashboard):
             elif self.coin_animation.timer < 45:
                 self.itemVel.y += 0.5
                 self.ItemPos.y += self.itemVel.y
-            self.screen.blit(
-                self.coin_animation.image, (self.ItemPos.x + cam.x, self.ItemPos.y)
-            )
         elif self.coin_animation.timer < 80:
             self.itemVel.y = -0.75
             self.ItemPos.y += self.itemVel.y
-            self.drawText("100", self.ItemPos.x + 3 + cam.x, self.ItemPos.y, 8)
+
+    def finish(self):
+        # the coin was already collected and its animation played
+        self.sound_played = True
+        self.coin_animation.timer = 80
+
+    def draw(self, cam, alpha):
+        x = self.ItemPos.x + cam.drawX(alpha)
+        if self.coin_animation.timer < 45:
+            dirtyRects.add(self.screen.blit(self.coin_animation.image, (x, self.ItemPos.y)))
+        elif self.coin_animation.timer < 80:
+            self.drawText("100", x + 3, self.ItemPos.y, 8)
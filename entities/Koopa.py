@@ -1,7 +1,6 @@
 import pygame
 
 from classes.Animation import Animation
-from classes.Collider import Collider
 from classes.EntityCollider import EntityCollider
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
@@ -24,60 +23,54 @@ class Koopa(EntityBase):
         self.timeAfterDeath = 35
         self.type = "Mob"
         self.dashboard = level.dashboard
-        self.collision = Collider(self, level)
         self.EntityCollider = EntityCollider(self)
         self.levelObj = level
         self.sound = sound
 
     def update(self, camera):
         if self.alive and self.active:
-            self.updateAlive(camera)
-            self.checkEntityCollision()
+            self.updateAlive()
+            self.levelObj.mobEngine.queueCollision(self)
         elif self.alive and not self.active and not self.bouncing:
-            self.sleepingInShell(camera)
-            self.checkEntityCollision()
+            self.sleepingInShell()
+            self.levelObj.mobEngine.queueCollision(self)
         elif self.bouncing:
-            self.shellBouncing(camera)
+            self.shellBouncing()
 
-    def drawKoopa(self, camera):
+    def draw(self, camera, alpha):
+        x, y = self.drawPos(camera, alpha)
+        if (self.alive and self.active) or self.bouncing:
+            self.drawKoopa(x, y)
+        elif self.alive:
+            self.screen.blit(self.spriteCollection.get("koopa-hiding").image, (x, y - 32))
+
+    def drawKoopa(self, x, y):
         if self.leftrightTrait.direction == -1:
-            self.screen.blit(
-                self.animation.image, (self.rect.x + camera.x, self.rect.y - 32)
-            )
+            self.screen.blit(self.animation.image, (x, y - 32))
         else:
             self.screen.blit(
-                pygame.transform.flip(self.animation.image, True, False),
-                (self.rect.x + camera.x, self.rect.y - 32),
+                pygame.transform.flip(self.animation.image, True, False), (x, y - 32)
             )
 
-    def shellBouncing(self, camera):
+    def shellBouncing(self):
         self.leftrightTrait.speed = 4
-        self.applyGravity()
         self.animation.image = self.spriteCollection.get("koopa-hiding").image
-        self.drawKoopa(camera)
         self.leftrightTrait.update()
 
-    def sleepingInShell(self, camera):
-        if self.timer < self.timeAfterDeath:
-            self.screen.blit(
-                self.spriteCollection.get("koopa-hiding").image,
-                (self.rect.x + camera.x, self.rect.y - 32),
-            )
-        else:
+    def sleepingInShell(self):
+        if self.timer >= self.timeAfterDeath:
             self.alive = True
             self.active = True
             self.bouncing = False
             self.timer = 0
         self.timer += 0.1
 
-    def updateAlive(self, camera):
-        self.applyGravity()
-        self.drawKoopa(camera)
+    def updateAlive(self):
         self.animation.update()
         self.leftrightTrait.update()
 
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.shellGrid.query(self.rect):
             if ent is not self:
                 collisionState = self.EntityCollider.check(ent)
                 if collisionState.isColliding:
@@ -1,13 +1,13 @@
 import pygame
-import cv2
-import sys
 
 from classes.Animation import Animation
+from classes.Assets import assets
 from classes.Camera import Camera
 from classes.Collider import Collider
 from classes.EntityCollider import EntityCollider
+from classes.GameOver import GameOver
 from classes.Input import Input
-from classes.Sprites import Sprites
+from classes.Profiler import profiler
 from entities.EntityBase import EntityBase
 from entities.Mushroom import RedMushroom
 from traits.bounce import bounceTrait
@@ -15,7 +15,7 @@ from traits.go import GoTrait
 from traits.jump import JumpTrait
 from classes.Pause import Pause
 
-spriteCollection = Sprites().spriteCollection
+spriteCollection = assets.sprites().spriteCollection
 smallAnimation = Animation(
     [
         spriteCollection["mario_run1"].image,
@@ -56,12 +56,13 @@ bigHappyAnimation = Animation(
 
 
 class Mario(EntityBase):
-    def __init__(self, x, y, level, screen, dashboard, sound, gravity=0.8, display_surface=None):
+    def __init__(self, x, y, level, screen, dashboard, sound, gravity=0.8, headless=False,
+                 inputSource=None):
         super(Mario, self).__init__(x, y, gravity)
-        self.display_surface = display_surface
+        self.headless = headless
         self.camera = Camera(self.rect, self)
         self.sound = sound
-        self.input = Input(self)
+        self.input = Input(self, inputSource)
         self.inAir = False
         self.inJump = False
         self.powerUpState = 0
@@ -80,11 +81,20 @@ class Mario(EntityBase):
         self.restart = False
         self.pause = False
         self.pauseObj = Pause(screen, self, dashboard)
+        self.dying = False
+        self.gameOverScreen = GameOver(screen, sound)
         
         self.happyTimer = 0
         self.isHappy = False
+        # set when Meloni is reached, the game goes on to the next level
+        self.won = False
+
+    def release(self):
+        self.pauseObj.release()
+        self.gameOverScreen.release()
 
     def update(self, events):
+        self.beginStep()
         if self.invincibilityFrames > 0:
             self.invincibilityFrames -= 1
         
@@ -105,20 +115,25 @@ class Mario(EntityBase):
                 self.traits['goTrait'].updateAnimation(bigAnimation)
 
         self.updateTraits()
+        profiler.begin("physics")
         self.moveMario()
+        profiler.end("physics")
         self.camera.move()
         self.applyGravity()
+        profiler.begin("collision")
         self.checkEntityCollision()
+        profiler.end("collision")
         self.input.checkForInput(events)
 
+    def draw(self, alpha=1.0):
+        self.traits["goTrait"].draw(alpha)
+
     def moveMario(self):
-        self.rect.y += self.vel.y
-        self.collision.checkY()
-        self.rect.x += self.vel.x
-        self.collision.checkX()
+        self.collision.moveY()
+        self.collision.moveX()
 
     def checkEntityCollision(self):
-        for ent in self.levelObj.entityList:
+        for ent in self.levelObj.entityGrid.query(self.rect):
             collisionState = self.EntityCollider.check(ent)
             if collisionState.isColliding:
                 if ent.type == "Item":
@@ -131,7 +146,7 @@ class Mario(EntityBase):
                     self.winGame()
 
     def _onCollisionWithItem(self, item):
-        self.levelObj.entityList.remove(item)
+        self.levelObj.removeEntity(item)
         self.dashboard.points += 100
         self.dashboard.coins += 1
         self.sound.play_sfx(self.sound.coin)
@@ -186,7 +201,7 @@ class Mario(EntityBase):
 
     def killEntity(self, ent):
         if ent.__class__.__name__ != "Koopa":
-            ent.alive = False
+            ent.kill()
         else:
             ent.timer = 0
             ent.leftrightTrait.speed = 1
@@ -197,98 +212,20 @@ class Mario(EntityBase):
         self.sound.play_sfx(self.sound.ah)
 
     def gameOver(self):
+        if self.dying:
+            return
         # Stop music and play death sound
         self.sound.music_channel.stop()
         self.sound.music_channel.play(self.sound.death)
-        
-        # Load out.png image
-        try:
-            out_image = pygame.image.load("./img/out.png").convert_alpha()
-        except:
-            out_image = pygame.image.load("./img/out.png")
-        
-        # Get original image dimensions
-        original_width, original_height = out_image.get_size()
-        
-        # Calculate target size (25% of screen = 160x120 for 640x480 screen)
-        screen_width, screen_height = 640, 480
-        target_width = int(screen_width * 0.25)
-        target_height = int(screen_height * 0.25)
-        
-        # Maintain aspect ratio
-        aspect_ratio = original_width / original_height
-        if target_width / target_height > aspect_ratio:
-            target_width = int(target_height * aspect_ratio)
-        else:
-            target_height = int(target_width / aspect_ratio)
-        
-        # Animation parameters
-        total_frames = 66  # 1.1 seconds at 60fps
-        center_x = screen_width // 2
-        center_y = screen_height // 2
-        
-        # Create font for "YOUR OUT" text
-        font = pygame.font.Font(None, 48)
-        
-        clock = pygame.time.Clock()
-        
-        # Animate from 0% to 100% scale over 1.1 seconds
-        for frame in range(total_frames + 1):
-            # Calculate current scale (0 to 1)
-            scale = frame / total_frames
-            
-            # Calculate current dimensions
-            current_width = int(target_width * scale)
-            current_height = int(target_height * scale)
-            
-            if current_width > 0 and current_height > 0:
-                # Scale the image
-                scaled_image = pygame.transform.scale(out_image, (current_width, current_height))
-                
-                # Calculate position to center the image
-                image_x = center_x - current_width // 2
-                image_y = center_y - current_height // 2
-                
-                # Fill screen with black
-                self.screen.fill((0, 0, 0))
-                
-                # Draw the scaled image
-                self.screen.blit(scaled_image, (image_x, image_y))
-                
-                # Draw "YOUR OUT" text below the image (fade in with the image)
-                text = font.render("YOUR OUT", True, (255, 255, 255))
-                text.set_alpha(int(255 * scale))
-                text_rect = text.get_rect(center=(center_x, image_y + current_height + 40))
-                self.screen.blit(text, text_rect)
-                
-                # Update display
-                if self.display_surface:
-                    scaled = pygame.transform.scale(self.screen, self.display_surface.get_size())
-                    self.display_surface.blit(scaled, (0, 0))
-                
-                pygame.display.update()
-                
-                # Handle events
-                events = pygame.event.get()
-                for event in events:
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                
-                clock.tick(60)  # 60 fps
-        
-        # Wait for death sound to finish
-        while self.sound.music_channel.get_busy():
-            # Keep displaying the final frame
-            if self.display_surface:
-                scaled = pygame.transform.scale(self.screen, self.display_surface.get_size())
-                self.display_surface.blit(scaled, (0, 0))
-            pygame.display.update()
-            events = pygame.event.get()
-            self.input.checkForInput(events)
-            clock.tick(60)
-        
-        self.restart = True
+
+        if self.headless:
+            self.restart = True
+            return
+
+        # the main loop shows the game over screen until the death sound
+        # has ended, then restarts
+        self.dying = True
+        self.gameOverScreen.start()
 
     def getPos(self):
         return self.camera.x + self.rect.x, self.rect.y
@@ -306,89 +243,8 @@ class Mario(EntityBase):
                 self.invincibilityFrames = 20
 
     def winGame(self):
+        self.won = True
         # Stop music
         self.sound.music_channel.stop()
-        
-        # Show Win Screen First
-        font = pygame.font.Font(None, 74)
-        text = font.render("You Won!", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(320, 240))
-        
-        # Show text for 3 seconds or until key press
-        start_time = pygame.time.get_ticks()
-        waiting = True
-        while waiting:
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(text, text_rect)
-            
-            if self.display_surface:
-                scaled = pygame.transform.scale(self.screen, self.display_surface.get_size())
-                self.display_surface.blit(scaled, (0, 0))
-                
-            pygame.display.update()
-            
-            if pygame.time.get_ticks() - start_time > 3000:
-                waiting = False
-                
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    waiting = False
-
-        # Play video
-        cap = cv2.VideoCapture("./img/win_video.mp4")
-        if not cap.isOpened():
-            print("Error opening video file")
-        else:
-            # Play end music on loop
-            self.sound.music_channel.play(self.sound.end_music, loops=-1)
-            
-            clock = pygame.time.Clock()
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if ret:
-                    # Convert frame to pygame surface
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    
-                    # Scale to fit screen while maintaining aspect ratio
-                    h, w = frame.shape[:2]
-                    screen_w, screen_h = 640, 480
-                    scale = min(screen_w/w, screen_h/h)
-                    new_w, new_h = int(w * scale), int(h * scale)
-                    frame = cv2.resize(frame, (new_w, new_h))
-                    
-                    surf = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-                    
-                    # Center the video
-                    x_pos = (screen_w - new_w) // 2
-                    y_pos = (screen_h - new_h) // 2
-                    
-                    self.screen.fill((0, 0, 0))
-                    self.screen.blit(surf, (x_pos, y_pos))
-                    
-                    if self.display_surface:
-                        scaled = pygame.transform.scale(self.screen, self.display_surface.get_size())
-                        self.display_surface.blit(scaled, (0, 0))
-                        
-                    pygame.display.update()
-                    
-                    # Handle events to allow exit
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            cap.release()
-                            self.sound.music_channel.stop()
-                            pygame.quit()
-                            sys.exit()
-                        if event.type == pygame.KEYDOWN: # Allow skipping video
-                             cap.release()
-                             break
-                    
-                    clock.tick(30) # Limit FPS
-                else:
-                    break
-            cap.release()
-            self.sound.music_channel.stop()
-        
+        # the win screen and video are shown by the scene manager
         self.restart = True
@@ -9,4 +9,7 @@ class Meloni(EntityBase):
         self.type = "Meloni"
 
     def update(self, cam):
-        self.screen.blit(self.image, (self.rect.x + cam.x, self.rect.y))
+        pass
+
+    def draw(self, cam, alpha):
+        self.screen.blit(self.image, self.drawPos(cam, alpha))
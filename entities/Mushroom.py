@@ -2,7 +2,6 @@ from classes.Animation import Animation
 from classes.Maths import Vec2D
 from entities.EntityBase import EntityBase
 from traits.leftrightwalk import LeftRightWalkTrait
-from classes.Collider import Collider
 from classes.EntityCollider import EntityCollider
 
 
@@ -19,29 +18,34 @@ class RedMushroom(EntityBase):
         self.leftrightTrait = LeftRightWalkTrait(self, level)
         self.type = "Mob"
         self.dashboard = level.dashboard
-        self.collision = Collider(self, level)
         self.EntityCollider = EntityCollider(self)
         self.levelObj = level
         self.sound = sound
+        self.textPos = Vec2D(0, 0)
 
     def update(self, camera):
         if self.alive:
-            self.applyGravity()
-            self.drawRedMushroom(camera)
+            self.animation.update()
             self.leftrightTrait.update()
-            self.checkEntityCollision()
+            self.levelObj.mobEngine.queueCollision(self)
         else:
-            self.onDead(camera)
+            self.onDead()
 
-    def drawRedMushroom(self, camera):
-        self.screen.blit(self.animation.image, (self.rect.x + camera.x, self.rect.y))
-        self.animation.update()
+    def draw(self, camera, alpha):
+        if self.alive:
+            self.screen.blit(self.animation.image, self.drawPos(camera, alpha))
+        else:
+            self.drawPointsText(camera, alpha)
+
+    def kill(self):
+        # the points text starts where the entity died; it can be drawn
+        # before the next update
+        self.alive = False
+        self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
 
-    def onDead(self, camera):
-        if self.timer == 0:
-            self.setPointsTextStartPosition(self.rect.x + 3, self.rect.y)
+    def onDead(self):
         if self.timer < self.timeAfterDeath:
-            self.movePointsTextUpAndDraw(camera)
+            self.textPos.y += -0.5
         else:
             self.alive = None
         self.timer += 0.1
@@ -49,9 +53,8 @@ class RedMushroom(EntityBase):
     def setPointsTextStartPosition(self, x, y):
         self.textPos = Vec2D(x, y)
 
-    def movePointsTextUpAndDraw(self, camera):
-        self.textPos.y += -0.5
-        self.dashboard.drawText("100", self.textPos.x + camera.x, self.textPos.y, 8)
+    def drawPointsText(self, camera, alpha):
+        self.dashboard.drawText("100", self.textPos.x + camera.drawX(alpha), self.textPos.y, 8)
 
     def checkEntityCollision(self):
         pass
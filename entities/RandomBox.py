@@ -19,6 +19,12 @@ class RandomBox(EntityBase):
         self.item = item
         self.level = level
 
+    def markUsed(self):
+        self.triggered = True
+        self.time = self.maxTime * 2
+        self.animation.image = self.spriteCollection.get("empty").image
+        self.item = None
+
     def update(self, cam):
         if self.alive and not self.triggered:
             self.animation.update()
@@ -35,8 +41,8 @@ class RandomBox(EntityBase):
                 if self.time < self.maxTime * 2:
                     self.time += 1
                     self.rect.y += self.vel
-        self.screen.blit(
-            self.spriteCollection.get("sky").image,
-            (self.rect.x + cam.x, self.rect.y + 2),
-        )
-        self.screen.blit(self.animation.image, (self.rect.x + cam.x, self.rect.y - 1))
+
+    def draw(self, cam, alpha):
+        x, y = self.drawPos(cam, alpha)
+        self.screen.blit(self.spriteCollection.get("sky").image, (x, y + 2))
+        self.screen.blit(self.animation.image, (x, y - 1))
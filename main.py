@@ -1,12 +1,31 @@
+import argparse
+
+# first, so the startup trace includes the imports below
+from classes.StartupTrace import startupTrace
+
+# the heavy libraries, timed on their own
+import numpy
 import pygame
-from classes.Dashboard import Dashboard
-from classes.Level import Level
-from classes.Menu import Menu
+
+startupTrace.mark("imports")
+
+# Mario's animations take the sprites when it is imported; taking them
+# first keeps loading them out of the game module imports
+from classes.Assets import assets
+
+assets.sprites()
+startupTrace.mark("sprites")
+
+from classes.DirtyRects import dirtyRects
+from classes.Presenter import Presenter, scalingModes
+from classes.SceneManager import SceneManager
+from classes.Scenes import MenuScene, Session
 from classes.Sound import Sound
-from entities.Mario import Mario
 
+startupTrace.mark("game modules")
 
 windowSize = 640, 480
+options = None
 
 
 def main():
@@ -18,66 +37,50 @@ def main():
     
     # Virtual screen (fixed resolution)
     virtual_screen = pygame.Surface(windowSize)
+    scaling = options.scaling if options is not None else "nearest"
+    presenter = Presenter(virtual_screen, display_screen, scaling)
+    startupTrace.mark("display")
     
-    max_frame_rate = 60
-    dashboard = Dashboard("./img/font.png", 8, virtual_screen)
+    max_frame_rate = options.max_fps if options is not None else 60
     sound = Sound()
-    level = Level(virtual_screen, sound, dashboard)
-    menu = Menu(virtual_screen, dashboard, level, sound)
-
-    while not menu.start:
-        # Get events once
-        events = pygame.event.get()
-        
-        # Handle resize events
-        for event in events:
-             if event.type == pygame.VIDEORESIZE:
-                 display_screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-             if event.type == pygame.QUIT:
-                 pygame.quit()
-                 return
-
-        menu.update(events)
-        
-        # Scale and blit to display
-        scaled = pygame.transform.scale(virtual_screen, display_screen.get_size())
-        display_screen.blit(scaled, (0, 0))
-        pygame.display.update()
+    startupTrace.mark("sound")
+    manager = SceneManager(presenter, max_frame_rate)
+    manager.run(MenuScene(Session(virtual_screen, sound, options)))
 
-    mario = Mario(0, 0, level, virtual_screen, dashboard, sound, display_surface=display_screen)
-    clock = pygame.time.Clock()
 
-    while not mario.restart:
-        pygame.display.set_caption("Super Mario running with {:d} FPS".format(int(clock.get_fps())))
-        
-        # Get events once
-        events = pygame.event.get()
-        
-        # Handle resize events
-        for event in events:
-             if event.type == pygame.VIDEORESIZE:
-                 display_screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-             if event.type == pygame.QUIT:
-                 pygame.quit()
-                 return
-
-        if mario.pause:
-            mario.pauseObj.update(events)
-        else:
-            level.drawLevel(mario.camera)
-            dashboard.update()
-            mario.update(events)
-            
-        # Scale and blit to display
-        scaled = pygame.transform.scale(virtual_screen, display_screen.get_size())
-        display_screen.blit(scaled, (0, 0))
-        pygame.display.update()
-        
-        clock.tick(max_frame_rate)
-    return 'restart'
+def seedValue(text):
+    # replays store the seed in 32 bits
+    seed = int(text)
+    if not 0 <= seed < 1 << 32:
+        raise argparse.ArgumentTypeError("the seed must be from 0 to {}".format((1 << 32) - 1))
+    return seed
 
 
 if __name__ == "__main__":
-    exitmessage = 'restart'
-    while exitmessage == 'restart':
-        exitmessage = main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only push the regions that changed to the window")
+    parser.add_argument("--scaling", choices=scalingModes, default="nearest",
+                        help="how the 640x480 frame fills the window; pixel-perfect uses whole "
+                             "multiples with black bars")
+    parser.add_argument("--asset-report", action="store_true",
+                        help="print asset and tile map memory once the level is loaded")
+    parser.add_argument("--max-fps", type=int, default=60,
+                        help="render frame cap; the game itself always steps at 60 Hz (0 = uncapped)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="save the input of the next session to a replay file")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play a recorded session back instead of reading the keyboard; "
+                             "Esc still pauses and quits")
+    parser.add_argument("--seed", type=seedValue,
+                        help="random seed for the level, recorded with --record")
+    parser.add_argument("--startup-trace", action="store_true",
+                        help="print how long imports, assets and the first frames took")
+    parser.add_argument("--startup-budget", type=float, default=500, metavar="MS",
+                        help="time to menu the startup trace checks against")
+    options = parser.parse_args()
+    dirtyRects.enabled = options.dirty_rects
+    startupTrace.enabled = options.startup_trace
+    startupTrace.menuBudget = options.startup_budget
+
+    main()
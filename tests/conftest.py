@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# the game loads its assets from paths relative to the repository root
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture(autouse=True)
+def repositoryRoot(monkeypatch):
+    monkeypatch.chdir(root)
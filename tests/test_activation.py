@@ -0,0 +1,51 @@
+import hashlib
+
+import pytest
+
+from benchmark import traces
+from classes.Input import ScriptedInputSource
+from classes.Simulation import Simulation
+
+# Mario's path through Level1-1 for each benchmark trace, as played when
+# every entity was updated every frame: the number of frames until the
+# trace ends or Mario dies, and a digest of his position after each one.
+# Culling must not change where the mobs are once Mario reaches them.
+expected = {
+    "idle": (225, "61a76cd3f24203df85e3c5ade814a2a180365f43"),
+    "walk": (60, "116ffdb6088c58bf1de6d9ca358bc59f0cdc1b80"),
+    "run-jump": (605, "f8fc96f257e6a102a9dc0a4ecdc12ef1b0e40cca"),
+    "back-and-forth": (60, "116ffdb6088c58bf1de6d9ca358bc59f0cdc1b80"),
+}
+
+
+def marioPath(levelName, segments):
+    source = ScriptedInputSource(segments)
+    sim = Simulation(levelName, source)
+    path = []
+    while not source.finished():
+        alive = sim.step()
+        path.append((sim.mario.rect.x, sim.mario.rect.y))
+        if not alive:
+            break
+    sim.release()
+    return path
+
+
+@pytest.mark.parametrize("traceName", sorted(expected))
+def test_level1_1_plays_as_before(traceName):
+    path = marioPath("Level1-1", traces[traceName])
+    frames, digest = expected[traceName]
+    assert len(path) == frames
+    assert hashlib.sha1(repr(path).encode("utf-8")).hexdigest() == digest
+
+
+def test_offscreen_mobs_keep_walking():
+    sim = Simulation("Level1-1")
+    mobs = list(sim.level.mobEngine.slots)
+    start = {mob: mob.rect.x for mob in mobs}
+    sim.run(30)
+    assert mobs
+    for mob in mobs:
+        assert mob in sim.level.awakeEntities
+        assert mob.rect.x != start[mob]
+    sim.release()
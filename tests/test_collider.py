@@ -0,0 +1,117 @@
+from classes.Collider import Collider
+from classes.TileMap import TileMap
+from entities.EntityBase import EntityBase
+
+
+class TileLevel:
+    # the parts of Level the Collider reads
+    def __init__(self, tileMap, levelLength):
+        self.tileMap = tileMap
+        self.levelLength = levelLength
+
+
+def mapWithGround(width=16, height=15, originX=0):
+    tileMap = TileMap(width, height, originX=originX)
+    for x in range(originX, originX + width):
+        tileMap.set(x, 12, "ground", True)
+    return tileMap
+
+
+def entityAt(x, y, velX=0, velY=0):
+    entity = EntityBase(0, 0, 1.25)
+    entity.rect.topleft = (x, y)
+    entity.vel.x = velX
+    entity.vel.y = velY
+    return entity
+
+
+def test_lands_on_ground_it_would_have_passed():
+    level = TileLevel(mapWithGround(), 16)
+    entity = entityAt(64, 10 * 32 - 5, velY=60)
+    Collider(entity, level).moveY()
+    assert entity.rect.bottom == 12 * 32
+    assert entity.onGround
+    assert entity.vel.y == 0
+
+
+def test_stops_under_a_ceiling():
+    tileMap = mapWithGround()
+    tileMap.set(2, 5, "brick", True)
+    level = TileLevel(tileMap, 16)
+    entity = entityAt(64, 6 * 32 + 4, velY=-10)
+    Collider(entity, level).moveY()
+    assert entity.rect.top == 6 * 32
+    assert not entity.onGround
+    assert entity.vel.y == 0
+
+
+def test_lands_on_a_box_a_pixel_above_its_cell():
+    tileMap = mapWithGround()
+    tileMap.set(3, 9, None, True, -1)
+    level = TileLevel(tileMap, 16)
+    entity = entityAt(96, 8 * 32 - 4, velY=8)
+    Collider(entity, level).moveY()
+    assert entity.rect.bottom == 9 * 32 - 1
+    assert entity.onGround
+
+
+def test_stops_at_a_wall_on_a_chunk_boundary():
+    # a window of two 8 column chunks from world column 8; the wall is
+    # the first column of the second chunk
+    tileMap = mapWithGround(originX=8)
+    tileMap.set(16, 11, "pipeL", True)
+    level = TileLevel(tileMap, 64)
+    entity = entityAt(15 * 32 - 3, 11 * 32, velX=6)
+    Collider(entity, level).moveX()
+    assert entity.rect.right == 16 * 32
+    assert entity.vel.x == 0
+
+
+def test_stops_at_a_wall_on_the_first_window_column():
+    tileMap = mapWithGround(originX=8)
+    tileMap.set(8, 11, "pipeR", True)
+    level = TileLevel(tileMap, 64)
+    entity = entityAt(9 * 32 + 2, 11 * 32, velX=-6)
+    Collider(entity, level).moveX()
+    assert entity.rect.left == 9 * 32
+    assert entity.vel.x == 0
+
+
+def test_walks_past_a_wall_it_does_not_reach():
+    tileMap = mapWithGround(originX=8)
+    tileMap.set(16, 11, "pipeL", True)
+    level = TileLevel(tileMap, 64)
+    entity = entityAt(14 * 32, 11 * 32, velX=6)
+    Collider(entity, level).moveX()
+    assert entity.rect.left == 14 * 32 + 6
+    assert entity.vel.x == 6
+
+
+def test_scroll_keeps_the_columns_still_inside():
+    tileMap = TileMap(16, 15)
+    tileMap.set(10, 3, "brick", True)
+    tileMap.set(2, 3, "brick", True)
+    tileMap.scroll(8)
+    assert tileMap.originX == 8
+    assert tileMap.isSolid(10, 3)
+    assert tileMap.spriteAt(10, 3) == "brick"
+    assert tileMap.rectAt(10, 3).topleft == (10 * 32, 3 * 32)
+    # the columns that came into view are empty
+    assert not any(tileMap.isSolid(x, 3) for x in range(16, 24))
+    assert not tileMap.inBounds(2, 3)
+    assert tileMap.inBounds(23, 3)
+    assert not tileMap.inBounds(24, 3)
+
+
+def test_scroll_back_and_past_the_window():
+    tileMap = TileMap(16, 15, originX=8)
+    tileMap.set(9, 3, "brick", True)
+    tileMap.set(20, 3, "brick", True)
+    tileMap.scroll(4)
+    assert tileMap.originX == 4
+    assert tileMap.isSolid(9, 3)
+    assert not tileMap.inBounds(20, 3)
+    assert not any(tileMap.isSolid(x, 3) for x in range(4, 8))
+    tileMap.scroll(40)
+    assert tileMap.originX == 40
+    assert not tileMap.solidGrid.any()
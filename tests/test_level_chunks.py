@@ -0,0 +1,31 @@
+from classes.LevelChunks import buildSpawns
+from classes.TileMap import TileMap
+
+entityKinds = ["CoinBox", "Goomba", "Koopa", "coin", "coinBrick", "RandomBox"]
+
+
+def levelData(length, **entities):
+    placed = {kind: [] for kind in entityKinds}
+    placed.update(entities)
+    return {"length": length, "level": {"entities": placed}}
+
+
+def meloniSpawns(data):
+    spawns = buildSpawns(data, TileMap(data["length"], 15))
+    return [spawn for spawn in spawns if spawn[1] == "Meloni"]
+
+
+def test_meloni_where_the_level_puts_it():
+    data = levelData(5000, Meloni=[[4990, 11]])
+    assert meloniSpawns(data) == [(4990, "Meloni", [4990, 11])]
+
+
+def test_meloni_near_the_end_of_a_level_without_one():
+    assert meloniSpawns(levelData(5000)) == [(4998, "Meloni", [4998, 12])]
+
+
+def test_koopas_are_filed_under_the_column_they_stand_in():
+    data = levelData(60, Goomba=[[12, 40]], Koopa=[[12, 40]])
+    spawns = buildSpawns(data, TileMap(60, 15))
+    assert (40, "Goomba", [12, 40]) in spawns
+    assert (39, "Koopa", [12, 40]) in spawns
@@ -0,0 +1,79 @@
+import pytest
+
+from classes.Collider import Collider
+from classes.Level import Level
+from classes.Simulation import Simulation
+from entities.EntityBase import EntityBase
+from entities.Goomba import Goomba
+from entities.Koopa import Koopa
+
+
+class ReferenceWalker:
+    # one mob moved on its own, the way LeftRightWalkTrait did before
+    # MobEngine: gravity, a turn when stopped, then Collider on each axis
+    def __init__(self, mob, level):
+        self.entity = EntityBase(0, 0, mob.gravity)
+        self.entity.rect = mob.rect.copy()
+        self.direction = mob.leftrightTrait.direction
+        self.speed = mob.leftrightTrait.speed
+        self.entity.vel.x = self.speed * self.direction
+        self.collider = Collider(self.entity, level)
+
+    def step(self):
+        entity = self.entity
+        entity.applyGravity()
+        if entity.vel.x == 0:
+            self.direction *= -1
+        entity.vel.x = self.speed * self.direction
+        self.collider.moveY()
+        self.collider.moveX()
+
+
+@pytest.fixture
+def level():
+    # the whole level loaded, so Collider sees every tile MobEngine does
+    sim = Simulation("Level1-1")
+    level = Level(sim.screen, sim.sound, sim.dashboard, chunksAhead=sim.level.source.chunkCount)
+    level.loadLevel("Level1-1")
+    yield level
+    level.release()
+    sim.release()
+
+
+def freeCells(level):
+    # start cells whose rect touches no solid tile
+    tileMap = level.tileMap
+    for x in range(0, level.levelLength - 1, 3):
+        for y in (1, 5, 9, 11):
+            if not any(tileMap.isSolid(x + dx, y + dy) for dx in (0, 1) for dy in (0, 1)):
+                yield x, y
+
+
+def test_mob_engine_matches_collider(level):
+    mobs = []
+    for i, (x, y) in enumerate(freeCells(level)):
+        if i % 2:
+            mob = Goomba(level.screen, level.sprites.spriteCollection, y, x + 1, level, level.sound)
+        else:
+            mob = Koopa(level.screen, level.sprites.spriteCollection, y + 1, x, level, level.sound)
+            if i % 4 == 0:
+                # a kicked shell
+                mob.leftrightTrait.speed = 4
+        mob.leftrightTrait.direction = 1 if i % 3 else -1
+        mob.vel.x = mob.leftrightTrait.speed * mob.leftrightTrait.direction
+        mobs.append(mob)
+    references = [ReferenceWalker(mob, level) for mob in mobs]
+    assert len(mobs) > 20
+
+    for frame in range(240):
+        walking = [(mob, reference) for mob, reference in zip(mobs, references) if mob.alive]
+        for mob, reference in walking:
+            mob.leftrightTrait.update()
+            reference.step()
+        level.mobEngine.step()
+        for mob, reference in walking:
+            expected = reference.entity
+            state = (mob.rect.x, mob.rect.y, mob.onGround, mob.alive is None)
+            assert state == (
+                expected.rect.x, expected.rect.y, expected.onGround, expected.alive is None
+            ), "frame {}".format(frame)
@@ -0,0 +1,77 @@
+import pygame
+import pytest
+
+from benchmark import traces
+from classes import Replay
+from classes.Input import ScriptedInputSource
+from classes.Replay import ReplayPlayer, ReplayRecorder
+from classes.Simulation import Simulation
+
+seed = 1234
+# a right click spawns a koopa, a goomba and a mushroom at the mouse,
+# so the mouse part of the format changes the game too
+clickFrame = 20
+
+
+def play(sim, source, limit=400):
+    while not source.finished() and sim.frame < limit:
+        events = []
+        if sim.frame == clickFrame:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=3, pos=(400, 200)))
+        if not sim.step(events):
+            break
+    frames = sim.frame
+    sim.release()
+    return frames
+
+
+@pytest.fixture
+def recording(tmp_path):
+    source = ScriptedInputSource(traces["run-jump"], mousePos=(400, 200))
+    recorder = ReplayRecorder(source, "Level1-1", seed)
+    frames = play(Simulation("Level1-1", recorder, seed=seed), source)
+    path = str(tmp_path / "run.replay")
+    recorder.save(path)
+    return path, recorder, frames
+
+
+def test_replay_round_trip(recording):
+    path, recorder, frames = recording
+    player = ReplayPlayer(path)
+    assert player.levelName == "Level1-1"
+    assert player.seed == seed
+    assert len(player.frames) == frames == len(recorder.frames)
+    assert [frame[3] for frame in player.frames] == [frame[3] for frame in recorder.frames]
+    assert any(frame[1] == [3] for frame in player.frames)
+
+    assert play(Simulation(player.levelName, player, seed=player.seed), player) == frames
+    assert player.finished()
+    assert player.divergedAt is None
+
+
+def test_replay_with_changed_input_diverges(recording):
+    path, recorder, frames = recording
+    player = ReplayPlayer(path)
+    # no keys held from frame 50 on
+    for i in range(50, len(player.frames)):
+        keys, buttons, mousePos, checksum = player.frames[i]
+        player.frames[i] = (player.released, buttons, mousePos, checksum)
+    play(Simulation(player.levelName, player, seed=player.seed), player)
+    assert player.divergedAt is not None
+    assert player.divergedAt >= 50
+
+
+@pytest.mark.parametrize("field, value", [("magic", b"XXXX"), ("version", Replay.version + 1)])
+def test_replay_rejects_other_formats(recording, tmp_path, field, value):
+    path = recording[0]
+    with open(path, "rb") as infile:
+        data = bytearray(infile.read())
+    fileMagic, fileVersion, fileSeed, nameLength = Replay.header.unpack_from(data)
+    fields = {"magic": fileMagic, "version": fileVersion}
+    fields[field] = value
+    Replay.header.pack_into(data, 0, fields["magic"], fields["version"], fileSeed, nameLength)
+    bad = str(tmp_path / "bad.replay")
+    with open(bad, "wb") as outfile:
+        outfile.write(data)
+    with pytest.raises(ValueError):
+        ReplayPlayer(bad)
@@ -1,5 +1,7 @@
 from pygame.transform import flip
 
+from classes.DirtyRects import dirtyRects
+
 
 class GoTrait:
     def __init__(self, animation, screen, camera, ent):
@@ -49,17 +51,18 @@ class GoTrait:
                     self.animation.inAir()
                 else:
                     self.animation.idle()
-        if (self.entity.invincibilityFrames//2) % 2 == 0:
-            self.drawEntity()
 
     def updateAnimation(self, animation):
         self.animation = animation
         self.update()
 
-    def drawEntity(self):
+    def draw(self, alpha):
+        if (self.entity.invincibilityFrames//2) % 2 == 0:
+            self.drawEntity(alpha)
+
+    def drawEntity(self, alpha):
+        pos = self.entity.drawPos(self.camera, alpha)
         if self.heading == 1:
-            self.screen.blit(self.animation.image, self.entity.getPos())
+            dirtyRects.add(self.screen.blit(self.animation.image, pos))
         elif self.heading == -1:
-            self.screen.blit(
-                flip(self.animation.image, True, False), self.entity.getPos()
-            )
+            dirtyRects.add(self.screen.blit(flip(self.animation.image, True, False), pos))
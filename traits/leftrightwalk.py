@@ -1,24 +1,27 @@
-import random
-
-from classes.Collider import Collider
-
-
 class LeftRightWalkTrait:
+    # a view of the mob's slot in the level's MobEngine, which moves and
+    # collides all walking mobs at once after the entities are updated
     def __init__(self, entity, level):
-        self.direction = random.choice([-1, 1])
         self.entity = entity
-        self.collDetection = Collider(self.entity, level)
-        self.speed = 1
-        self.entity.vel.x = self.speed * self.direction
+        self.mobs = level.mobEngine
+        self.slot = self.mobs.add(entity, level.random.choice([-1, 1]), 1)
 
-    def update(self):
-        if self.entity.vel.x == 0:
-            self.direction *= -1
-        self.entity.vel.x = self.speed * self.direction
-        self.moveEntity()
+    @property
+    def direction(self):
+        return int(self.mobs.direction[self.slot])
 
-    def moveEntity(self):
-        self.entity.rect.y += self.entity.vel.y
-        self.collDetection.checkY()
-        self.entity.rect.x += self.entity.vel.x
-        self.collDetection.checkX()
+    @direction.setter
+    def direction(self, value):
+        self.mobs.direction[self.slot] = value
+
+    @property
+    def speed(self):
+        return float(self.mobs.speed[self.slot])
+
+    @speed.setter
+    def speed(self, value):
+        self.mobs.speed[self.slot] = value
+
+    def update(self):
+        # gravity, walking and tile collision
+        self.mobs.queue(self.slot)